@@ -4,17 +4,35 @@ add_korean.py  (API-free 버전)
 jamdict(JMdict) 로 영어 뜻을 가져온 뒤
 영어→한국어 변환 테이블로 한국어 뜻을 생성하고
 tangoya/data/korean_dict.json 에 저장한다.
+
+실행 방법:
+  python3 build/add_korean.py [-j 4] [--batch 500] [--serial]
+
+- JMdict 항목은 jamdict 의 SQLite 파일에서 묶음 단위로 직접 조회하고,
+  묶음들을 워커 프로세스에 나눠 처리한다 (--serial: jmd.lookup() 1개씩).
+- 조회 결과는 build/.korean_cache.jsonl 에 (한자, 읽기, 변환 테이블 버전) 으로 캐시.
+  다시 실행하면 새 단어만 조회하고, EN_KO / MANUAL 이 바뀌었으면 캐시된 sense 로
+  뜻만 다시 계산한다 (손으로 고친 뜻은 유지).
+- 진행 중 결과는 data/korean_dict.journal.jsonl 에 추가 기록하고
+  korean_dict.json 은 마지막에 한 번만 저장한다. 중단 후 재실행 시 저널부터 복구.
 """
 
-import os, json, re
-from jamdict import Jamdict
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 
 # ── 경로 설정 ─────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR  = os.path.join(BASE_DIR, "data")
 OUT_FILE  = os.path.join(DATA_DIR, "korean_dict.json")
+JOURNAL_FILE = os.path.join(DATA_DIR, "korean_dict.journal.jsonl")
+CACHE_FILE   = os.path.join(BASE_DIR, "build", ".korean_cache.jsonl")
 
-jmd = Jamdict()
+BATCH_SIZE = 500
 
 # ══════════════════════════════════════════════════════════
 # 영어 글로스 → 한국어 직접 매핑 테이블 (자주 등장하는 표현 우선)
@@ -698,37 +716,29 @@ MANUAL: dict[str, str] = {
 # ══════════════════════════════════════════════════════════
 # 메인 변환 함수
 # ══════════════════════════════════════════════════════════
-def translate_word(reading, kanji):
-    """jamdict + 변환 테이블로 한국어 뜻 반환. 실패 시 '-'"""
-
-    # 1. 수동 사전 우선
+def manual_lookup(reading, kanji):
+    """1. 수동 사전 우선 (한자 → 읽기 순서). 없으면 None"""
     if kanji in MANUAL:
         return MANUAL[kanji]
     if reading in MANUAL:
         return MANUAL[reading]
+    return None
 
-    # 2. jamdict lookup (한자 → 읽기 순서)
-    result = jmd.lookup(kanji)
-    if not result.entries:
-        result = jmd.lookup(reading)
-    if not result.entries:
-        return "-"
 
-    entry = result.entries[0]
+def translate_senses(senses):
+    """JMdict 첫 항목의 sense 목록 [(품사 태그, 글로스), ...] → 한국어 뜻. 실패 시 '-'"""
+    if not senses:
+        return "-"
 
     # 3. 각 sense에서 한국어 매핑 시도
-    for sense in entry.senses:
-        pos_tags = [str(p) for p in sense.pos]
-        gloss_strs = [str(g) for g in sense.gloss]
-
+    for pos_tags, gloss_strs in senses:
         ko = gloss_to_korean(gloss_strs, pos_tags)
         if ko:
             return ko
 
     # 4. 매핑 실패 시: 첫 번째 영어 글로스를 가공
-    first_sense = entry.senses[0]
-    first_gloss = str(first_sense.gloss[0]).strip() if first_sense.gloss else ""
-    pos_tags = [str(p) for p in first_sense.pos]
+    _, first_glosses = senses[0]
+    first_gloss = first_glosses[0].strip() if first_glosses else ""
 
     # "to ~" 패턴이면 영어 원형으로 재시도
     if first_gloss.startswith("to "):
@@ -745,6 +755,173 @@ def translate_word(reading, kanji):
     return first_gloss if first_gloss else "-"
 
 
+def translate_word(reading, kanji):
+    """jamdict + 변환 테이블로 한국어 뜻 반환. 실패 시 '-' (단어 1개씩 조회)"""
+    manual = manual_lookup(reading, kanji)
+    if manual:
+        return manual
+
+    # 2. jamdict lookup (한자 → 읽기 순서)
+    jmd = get_jamdict()
+    result = jmd.lookup(kanji)
+    if not result.entries:
+        result = jmd.lookup(reading)
+    if not result.entries:
+        return "-"
+
+    senses = [([str(p) for p in s.pos], [str(g) for g in s.gloss])
+              for s in result.entries[0].senses]
+    return translate_senses(senses)
+
+
+def mapping_version():
+    """EN_KO / MANUAL 테이블 해시 — 테이블이 바뀌면 캐시된 뜻을 다시 계산"""
+    payload = json.dumps([EN_KO, MANUAL], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# ══════════════════════════════════════════════════════════
+# JMdict 일괄 조회 (jamdict SQLite 직접 접근)
+# ══════════════════════════════════════════════════════════
+_jmd = None
+
+
+def get_jamdict():
+    global _jmd
+    if _jmd is None:
+        from jamdict import Jamdict
+        _jmd = Jamdict()
+    return _jmd
+
+
+def jmdict_db_file():
+    """jamdict 가 사용하는 JMdict SQLite 파일 경로"""
+    return getattr(get_jamdict(), "db_file", None)
+
+
+def db_stamp(db_file):
+    st = os.stat(db_file)
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}"
+
+
+def open_jmdict(db_file):
+    return sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+
+
+def _fill_temp(cur, table, column, values):
+    cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} ({column} PRIMARY KEY)")
+    cur.execute(f"DELETE FROM {table}")
+    cur.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?)", ((v,) for v in values))
+
+
+def fetch_first_entries(conn, queries):
+    """
+    쿼리 문자열 묶음 → {쿼리: [(품사 태그, 글로스), ...]}
+    jmd.lookup(q).entries[0] 과 같은 항목을 묶음 단위 SQL 몇 번으로 가져온다.
+    jamdict 검색은 ORDER BY 없는 Entry 조회 한 번이다:
+      SELECT idseq FROM Entry WHERE idseq IN (한자 일치) OR idseq IN (가나 일치) OR idseq IN (글로스 일치)
+    SQLite 는 이 OR 를 조건별로 차례로 실행(MULTI-INDEX OR)하므로 결과 순서는
+    한자 일치(idseq 오름차순) → 새 가나 일치 → 새 글로스 일치 이고, 첫 항목은 합집합의 최소 idseq 가
+    아니라 먼저 일치한 테이블의 최소 idseq 다. 여기서는 이 순서를 실행 계획에 기대지 않고 명시적으로 따른다.
+    일치 항목이 없는 쿼리는 결과에 없음.
+    """
+    cur = conn.cursor()
+    _fill_temp(cur, "q", "text TEXT", [q for q in queries if q])
+
+    # 쿼리별 첫 항목 idseq — 순서가 곧 우선순위 (한자 → 가나 → 글로스, 앞에서 찾은 쿼리는 유지)
+    first = {}
+    for sql in (
+        # 큰 테이블을 한 번만 훑으면서 q(PK) 를 조회하도록 CROSS JOIN 으로 순서 고정
+        "SELECT q.text, MIN(t.idseq) FROM Kanji t CROSS JOIN q ON q.text = t.text GROUP BY q.text",
+        "SELECT q.text, MIN(t.idseq) FROM Kana t CROSS JOIN q ON q.text = t.text GROUP BY q.text",
+        "SELECT q.text, MIN(s.idseq) FROM SenseGloss g CROSS JOIN q ON q.text = g.text "
+        "JOIN Sense s ON s.ID = g.sid GROUP BY q.text",
+    ):
+        for text, idseq in cur.execute(sql):
+            first.setdefault(text, idseq)
+    if not first:
+        return {}
+
+    # 항목별 sense (ID 순) → 품사 / 글로스 (삽입 순)
+    _fill_temp(cur, "e", "idseq INTEGER", set(first.values()))
+    senses = {}
+    sense_owner = {}
+    for idseq, sid in cur.execute(
+            "SELECT s.idseq, s.ID FROM Sense s CROSS JOIN e ON e.idseq = s.idseq ORDER BY s.ID"):
+        pos_tags, glosses = [], []
+        senses.setdefault(idseq, []).append((pos_tags, glosses))
+        sense_owner[sid] = (pos_tags, glosses)
+
+    _fill_temp(cur, "sid", "id INTEGER", sense_owner)
+    for sid, text in cur.execute(
+            "SELECT p.sid, p.text FROM pos p CROSS JOIN sid ON sid.id = p.sid ORDER BY p.rowid"):
+        sense_owner[sid][0].append(text)
+    for sid, text in cur.execute(
+            "SELECT g.sid, g.text FROM SenseGloss g CROSS JOIN sid ON sid.id = g.sid "
+            "ORDER BY g.rowid"):
+        sense_owner[sid][1].append(text)
+
+    return {q: senses.get(idseq, []) for q, idseq in first.items()}
+
+
+# ── 멀티프로세스 워커 ───────────────────────────────────────
+_worker = {}
+
+
+def _init_worker(db_file):
+    _worker["conn"] = open_jmdict(db_file)
+
+
+def _lookup_chunk(chunk):
+    """[(읽기, 한자), ...] → [(읽기, 한자, senses 또는 None, 한국어 뜻), ...]"""
+    found = fetch_first_entries(_worker["conn"], [q for pair in chunk for q in pair])
+    results = []
+    for reading, kanji in chunk:
+        # 2. 한자 → 읽기 순서 (translate_word 와 동일)
+        senses = found.get(kanji) if kanji in found else found.get(reading)
+        results.append((reading, kanji, senses, translate_senses(senses)))
+    return results
+
+
+# ══════════════════════════════════════════════════════════
+# 조회 캐시 / 저널
+# ══════════════════════════════════════════════════════════
+def read_jsonl(path):
+    """JSON Lines 파일 → 레코드 목록 (중단으로 잘린 마지막 줄은 무시)"""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
+
+def load_cache():
+    """(캐시, 파일 줄 수). 캐시: {(한자, 읽기): {"db", "senses", "ver", "ko", ...}} — 같은 키는 마지막 줄이 우선"""
+    records = read_jsonl(CACHE_FILE)
+    return {(rec["kanji"], rec["reading"]): rec for rec in records}, len(records)
+
+
+def compact_cache(cache):
+    """덮어쓴 줄이 쌓인 캐시 파일을 키당 1줄로 다시 쓴다"""
+    tmp = CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for rec in cache.values():
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    os.replace(tmp, CACHE_FILE)
+
+
+def save_korean_dict(korean_dict):
+    tmp = OUT_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(korean_dict, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, OUT_FILE)
+
+
 # ══════════════════════════════════════════════════════════
 # 단어 수집
 # ══════════════════════════════════════════════════════════
@@ -769,6 +946,15 @@ def load_words():
 # 메인
 # ══════════════════════════════════════════════════════════
 def main():
+    parser = argparse.ArgumentParser(description="한국어 뜻 자동 생성 (jamdict)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="JMdict 조회 워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE,
+                        help=f"워커 1회 조회 단어 수 (기본: {BATCH_SIZE})")
+    parser.add_argument("--serial", action="store_true",
+                        help="일괄 SQL 대신 jmd.lookup() 으로 1개씩 조회")
+    args = parser.parse_args()
+
     print("단어 파일 로드 중...")
     words = load_words()
     print(f"  총 {len(words)}개 단어 (kanji 중복 제거 후)")
@@ -781,34 +967,86 @@ def main():
     else:
         korean_dict = {}
 
-    untranslated = [(r, k, l) for r, k, l in words if k not in korean_dict]
-    print(f"  미번역: {len(untranslated)}개\n")
+    # 이전 실행이 중단됐다면 저널에 남은 결과부터 반영
+    journal = read_jsonl(JOURNAL_FILE)
+    for rec in journal:
+        korean_dict[rec["k"]] = rec["v"]
+    if journal:
+        print(f"  중단된 실행 복구: {len(journal)}개 (저널)")
 
-    translated_count = 0
-    failed_count = 0
-    SAVE_INTERVAL = 500
+    cache, cache_lines = load_cache()
+    version = mapping_version()
+    db_file = None if args.serial else jmdict_db_file()
+    stamp = db_stamp(db_file) if db_file and os.path.exists(db_file) else None
+    if not args.serial and stamp is None:
+        print("  ⚠ JMdict SQLite 파일을 찾지 못함 → jmd.lookup() 으로 1개씩 조회")
 
-    for i, (reading, kanji, level) in enumerate(untranslated, 1):
-        ko = translate_word(reading, kanji)
-        if ko and ko != "-":
-            korean_dict[kanji] = ko
-            translated_count += 1
+    # 대상 선정: 미번역 단어 + 이전 규칙으로 자동 생성된 뒤 손대지 않은 단어
+    # (수동으로 고친 뜻은 캐시의 ko 와 달라지므로 그대로 둔다)
+    resolved = []   # (읽기, 한자, senses, 뜻) — DB 조회 불필요
+    pending = []    # (읽기, 한자) — DB 조회 필요
+    refreshed = 0
+    for reading, kanji, level in words:
+        rec = cache.get((kanji, reading))
+        if kanji in korean_dict:
+            if not (rec and rec["ver"] != version and rec["ko"] == korean_dict[kanji]):
+                continue
+            refreshed += 1
+        manual = manual_lookup(reading, kanji)
+        if manual:
+            resolved.append((reading, kanji, None, manual))
+        elif rec and rec["ver"] == version and rec["db"] == stamp:
+            resolved.append((reading, kanji, rec["senses"], rec["ko"]))
+        elif rec and rec["db"] == stamp and stamp is not None:
+            resolved.append((reading, kanji, rec["senses"], translate_senses(rec["senses"])))
         else:
-            korean_dict[kanji] = "-"
-            failed_count += 1
+            pending.append((reading, kanji))
+    todo = len(resolved) + len(pending)
+    print(f"  미번역: {todo - refreshed}개, 규칙 변경으로 재계산: {refreshed}개 "
+          f"(캐시 재사용 {len(resolved)}개, JMdict 조회 {len(pending)}개)\n")
 
-        # 진행 출력 (100개마다)
-        if i % 100 == 0:
-            print(f"  [{i}/{len(untranslated)}] 처리 중... ({len(korean_dict)}/{len(words)} 완료)")
+    done = appended = 0
+    with open(JOURNAL_FILE, "a", encoding="utf-8") as jf, \
+         open(CACHE_FILE, "a", encoding="utf-8") as cf:
 
-        # 중간 저장 (500개마다)
-        if i % SAVE_INTERVAL == 0:
-            with open(OUT_FILE, "w", encoding="utf-8") as f:
-                json.dump(korean_dict, f, ensure_ascii=False, indent=2)
+        def apply(results):
+            nonlocal done, appended
+            for reading, kanji, senses, ko in results:
+                value = ko if ko and ko != "-" else "-"
+                korean_dict[kanji] = value
+                jf.write(json.dumps({"k": kanji, "v": value}, ensure_ascii=False) + "\n")
+                rec = {"kanji": kanji, "reading": reading, "db": stamp,
+                       "senses": senses, "ver": version, "ko": value}
+                if cache.get((kanji, reading)) != rec:
+                    cache[(kanji, reading)] = rec
+                    cf.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                    appended += 1
+                done += 1
+            # 체크포인트: 묶음마다 저널/캐시 줄을 디스크에 반영
+            jf.flush()
+            cf.flush()
+            print(f"  [{done}/{todo}] 처리 중... ({len(korean_dict)}/{len(words)} 완료)")
 
-    # 최종 저장
-    with open(OUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(korean_dict, f, ensure_ascii=False, indent=2)
+        if resolved:
+            apply(resolved)
+
+        if pending and stamp is not None:
+            chunks = [pending[i:i + args.batch] for i in range(0, len(pending), args.batch)]
+            jobs = max(1, min(args.jobs, len(chunks)))
+            with ProcessPoolExecutor(jobs, initializer=_init_worker,
+                                     initargs=(db_file,)) as pool:
+                for results in pool.map(_lookup_chunk, chunks):
+                    apply(results)
+        elif pending:
+            for i in range(0, len(pending), args.batch):
+                apply([(r, k, None, translate_word(r, k))
+                       for r, k in pending[i:i + args.batch]])
+
+    # 최종 저장 (1회) 후 저널 정리
+    save_korean_dict(korean_dict)
+    os.remove(JOURNAL_FILE)
+    if cache_lines + appended > 2 * len(cache):
+        compact_cache(cache)
 
     # 통계
     total = len(words)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+bench.py  —  tangoya 성능 벤치마크
+---------------------------------
+빌드·서빙·분석 핫패스를 측정해 JSON 으로 출력합니다.
+
+실행 방법:
+  python3 build/bench.py                         # 전체 측정 → 표준출력(JSON)
+  python3 build/bench.py -o base.json            # 결과 저장
+  python3 build/bench.py --compare base.json     # 기준 결과와 비교 (회귀 시 종료 코드 1)
+  python3 build/bench.py --only serve,analysis   # 일부 항목만
+
+측정 항목:
+  build     build_html.py --force 전체 실행 시간 (build_assets.py 번들·압축 포함)
+  dict      jlpt_dict.json 크기(원본/gzip), Python json.loads 시간
+  serve     start_server.py 핸들러 부하 테스트 — 동시 클라이언트로
+            Kuromoji 사전·jlpt_dict.json·폰트·/ping 요청 (처리량, p50/p99)
+            + mixed: 사전 파일 동시 다운로드 중 /ping 지연 (p50/p99)
+  cold      start_server.py 프로세스 시작 → tangoya.html 첫 바이트까지
+
+build / cold 는 build/ · data/ · dist/ 의 임시 복사본에서 실행하고
+서버의 GitHub 동기화도 끄므로 (TANGOYA_GITHUB_SYNC=0) 실제 dist/ 와 user_data.json 은 바뀌지 않습니다.
+  analysis  (Node.js) 템플릿의 lookupWord / autoMergeCustomWords 를
+            합성 장문 + 커스텀 단어로 측정, JSON.parse·loadJlptDict 시간
+  parity    kuromoji_engine.py ↔ kuromoji.js 토큰 전 필드 비교 (kuromoji_parity.py, 합성 문장 300개)
+
+결과 형식:
+  {"meta": {...}, "metrics": {"serve.ping.p99_ms": 1.2, ...}, "checks": {...}}
+  metrics 는 이름 끝으로 방향을 판단합니다 (_per_s / _rps / _mbps 는 클수록 좋음, 나머지는 작을수록).
+  checks 는 결과값 지문(병합 후 토큰 수 등)으로, 기준과 다르면 동작 변화로 표시합니다.
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# ── 경로 설정 ──────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR   = os.path.dirname(SCRIPT_DIR)
+DIST_DIR   = os.path.join(BASE_DIR, "dist")
+DICT_PATH  = os.path.join(DIST_DIR, "jlpt_dict.json")
+TEMPLATE   = os.path.join(DIST_DIR, "tangoya_template.html")
+ANALYSIS_JS = os.path.join(SCRIPT_DIR, "bench_analysis.js")
+
+SECTIONS = ["build", "dict", "serve", "cold", "analysis", "parity"]
+SANDBOX_DIRS = ["build", "data", "dist"]   # build / cold 측정용 임시 복사 대상
+
+# 분석 벤치마크 (토큰 수, 커스텀 단어 수)
+ANALYSIS_CASES = [(100, 20), (200, 50), (300, 50), (2000, 300)]
+ANALYSIS_CASES_LONG = ANALYSIS_CASES + [(10000, 1000), (50000, 3000)]
+
+HIGHER_IS_BETTER = ("_per_s", "_rps", "_mbps")
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def log(msg):
+    print(msg, file=sys.stderr, flush=True)
+
+
+def make_sandbox():
+    """build/ · data/ · dist/ 를 임시 폴더에 복사해 경로 반환 (측정이 실제 파일을 바꾸지 않도록)"""
+    root = tempfile.mkdtemp(prefix="tangoya-bench-")
+    ignore = shutil.ignore_patterns("__pycache__", "*.tmp")
+    for name in SANDBOX_DIRS:
+        shutil.copytree(os.path.join(BASE_DIR, name), os.path.join(root, name), ignore=ignore)
+    return root
+
+
+# ══════════════════════════════════════════════════════════
+# build / dict
+# ══════════════════════════════════════════════════════════
+def bench_build(metrics, repeat, sandbox):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(sandbox, "build", "build_html.py"), "--force"],
+                       check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    metrics["build.html_force_s"] = min(times)
+
+
+def bench_dict(metrics):
+    with open(DICT_PATH, "rb") as f:
+        raw = f.read()
+    metrics["dict.size_bytes"] = len(raw)
+    metrics["dict.gzip_bytes"] = len(gzip.compress(raw, 6))
+    text = raw.decode("utf-8")
+    runs = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        json.loads(text)
+        runs.append(time.perf_counter() - t0)
+    metrics["dict.parse_py_ms"] = statistics.median(runs) * 1000
+
+
+# ══════════════════════════════════════════════════════════
+# serve — 별도 프로세스의 서버에 동시 요청
+# ══════════════════════════════════════════════════════════
+SERVER_CODE = """
+import functools, os, sys
+sys.path.insert(0, {dist!r})
+import start_server
+server = start_server.ThreadingServer(('127.0.0.1', 0),
+                                      functools.partial(start_server.QuietHandler, directory={dist!r}))
+print(server.server_address[1], flush=True)
+sys.stdout = open(os.devnull, 'w')   # 요청 로그가 파이프를 채워 서버가 멈추지 않도록
+server.serve_forever()
+"""
+
+
+def serve_targets():
+    """(이름, 경로) — 폰트는 있는 woff2 중 첫 번째, 없으면 fonts.css"""
+    fonts_dir = os.path.join(DIST_DIR, "fonts")
+    woff2 = sorted(f for f in os.listdir(fonts_dir) if f.endswith(".woff2")) \
+        if os.path.isdir(fonts_dir) else []
+    return [
+        ("kuromoji_dict", "/dict/base.dat.gz"),
+        ("jlpt_dict",     "/jlpt_dict.json"),
+        ("font",          f"/fonts/{woff2[0]}" if woff2 else "/fonts/fonts.css"),
+        ("ping",          "/ping"),
+    ]
+
+
+def _client(port, path, deadline, latencies, counters):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException):
+                counters["errors"] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            latencies.append(time.perf_counter() - t0)
+            counters["bytes"] += len(body)
+            if resp.status != 200:
+                counters["errors"] += 1
+    finally:
+        conn.close()
+
+
+def _load(port, groups, duration):
+    """groups: [(경로, 클라이언트 수), ...] 를 동시에 duration 초 실행.
+    경로별 (latencies, counters) 목록과 경과 시간 반환"""
+    results = [([], {"bytes": 0, "errors": 0}) for _ in groups]
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=_client, args=(port, path, deadline) + result)
+               for (path, count), result in zip(groups, results)
+               for _ in range(count)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - t0
+
+
+def _record(metrics, checks, prefix, path, latencies, counters, elapsed):
+    """처리량·지연 기록. 성공한 요청이 없으면 지연 대신 오류 수만 남김"""
+    checks[f"{prefix}.path"]   = path
+    checks[f"{prefix}.errors"] = counters["errors"]
+    if not latencies:
+        log(f"  ✗ serve {prefix[6:]:<14} 성공한 요청 없음 (오류 {counters['errors']}건)")
+        return
+    metrics[f"{prefix}.rps"]    = len(latencies) / elapsed
+    metrics[f"{prefix}.mbps"]   = counters["bytes"] / elapsed / 1e6
+    metrics[f"{prefix}.p50_ms"] = percentile(latencies, 50) * 1000
+    metrics[f"{prefix}.p99_ms"] = percentile(latencies, 99) * 1000
+    log(f"  serve {prefix[6:]:<14} {len(latencies) / elapsed:>9.1f} req/s  "
+        f"p50 {metrics[prefix + '.p50_ms']:.2f} ms  p99 {metrics[prefix + '.p99_ms']:.2f} ms")
+
+
+def bench_serve(metrics, checks, clients, duration):
+    proc = subprocess.Popen([sys.executable, "-c", SERVER_CODE.format(dist=DIST_DIR)],
+                            stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(proc.stdout.readline())
+        targets = serve_targets()
+        for name, path in targets:
+            [(latencies, counters)], elapsed = _load(port, [(path, clients)], duration)
+            _record(metrics, checks, f"serve.{name}", path, latencies, counters, elapsed)
+
+        # mixed: 사전 파일을 동시에 받는 중의 /ping 지연 (페이지 로딩 중 워치독 ping 과 같은 상황)
+        paths = dict(targets)
+        (dict_result, ping_result), elapsed = _load(
+            port, [(paths["kuromoji_dict"], clients), (paths["ping"], 1)], duration)
+        _record(metrics, checks, "serve.mixed_dict", paths["kuromoji_dict"], *dict_result, elapsed)
+        _record(metrics, checks, "serve.mixed_ping", paths["ping"], *ping_result, elapsed)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+# ══════════════════════════════════════════════════════════
+# cold — 프로세스 시작 → tangoya.html 첫 바이트
+# ══════════════════════════════════════════════════════════
+def _cold_start_once(timeout, dist_dir):
+    env = dict(os.environ, BROWSER="true", PYTHONUNBUFFERED="1",  # 브라우저 실행 대신 no-op
+               TANGOYA_GITHUB_SYNC="0")                           # user_data.json 을 바꾸지 않도록
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(dist_dir, "start_server.py")],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env)
+    output = []
+    try:
+        port = None
+        while port is None:
+            line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError("서버가 시작 전에 종료됨: " + " / ".join(output[-3:]))
+            output.append(line.strip())
+            if "URL" in line and "localhost:" in line:
+                port = int(line.split("localhost:")[1].split("/")[0])
+            if time.perf_counter() - t0 > timeout:
+                raise RuntimeError("시간 초과")
+        while True:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+                conn.request("GET", "/tangoya.html")
+                resp = conn.getresponse()
+                resp.read(1)
+                first_byte = time.perf_counter() - t0
+                conn.close()
+                return first_byte
+            except ConnectionRefusedError:
+                if time.perf_counter() - t0 > timeout:
+                    raise RuntimeError("시간 초과")
+                time.sleep(0.005)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def bench_cold(metrics, checks, repeat, sandbox, timeout=60):
+    runs = []
+    try:
+        for _ in range(repeat):
+            runs.append(_cold_start_once(timeout, os.path.join(sandbox, "dist")))
+    except RuntimeError as e:
+        checks["cold.error"] = str(e)
+        log(f"  ✗ cold start: {e}")
+        return
+    metrics["cold.first_byte_ms"] = min(runs) * 1000
+    metrics["cold.first_byte_median_ms"] = statistics.median(runs) * 1000
+
+
+# ══════════════════════════════════════════════════════════
+# analysis — Node.js 로 템플릿 함수 측정
+# ══════════════════════════════════════════════════════════
+def bench_analysis(metrics, checks, cases):
+    node = shutil.which("node")
+    if not node:
+        checks["analysis.error"] = "node 없음"
+        log("  ✗ analysis: node 를 찾을 수 없어 건너뜀")
+        return
+    opts = {"template": TEMPLATE, "dict": DICT_PATH, "cases": cases}
+    out = subprocess.run([node, ANALYSIS_JS, json.dumps(opts)],
+                         check=True, capture_output=True, text=True).stdout
+    result = json.loads(out)
+    metrics["analysis.dict_parse_ms"] = result["dict_parse_ms"]
+    metrics["analysis.dict_load_ms"]  = result["dict_load_ms"]
+    for case in result["cases"]:
+        prefix = f"analysis.t{case['tokens']}_c{case['custom_words']}"
+        metrics[f"{prefix}.lookup_ms"]           = case["lookup_ms"]
+        metrics[f"{prefix}.lookup_tokens_per_s"] = case["lookup_tokens_per_s"]
+        metrics[f"{prefix}.merge_ms"]            = case["merge_ms"]
+        checks[f"{prefix}.merged_tokens"]        = case["merged_tokens"]
+        log(f"  analysis {case['tokens']:>6} tokens / {case['custom_words']:>4} custom: "
+            f"lookup {case['lookup_ms']:.2f} ms, merge {case['merge_ms']:.1f} ms")
+
+
+# ══════════════════════════════════════════════════════════
+# parity — Python 형태소 분석기와 kuromoji.js 비교
+# ══════════════════════════════════════════════════════════
+def bench_parity(metrics, checks, count=300):
+    import kuromoji_parity
+    try:
+        texts = kuromoji_parity.synthetic_texts(count, seed=1)
+        t0 = time.perf_counter()
+        result = kuromoji_parity.compare(texts)
+    except (OSError, RuntimeError) as e:
+        checks["parity.error"] = str(e)
+        log(f"  ✗ parity: {e}")
+        return
+    metrics["parity.compare_s"] = time.perf_counter() - t0
+    checks["parity.ok"] = result["ok"]
+    checks["parity.segmentation_mismatches"] = result["segmentation_mismatches"]
+    checks["parity.field_mismatches"] = sum(result["field_mismatches"].values())
+    checks["parity.known_without_pos"] = result["known_without_pos"]
+    log(f"  parity {result['texts']}개 문장 / {result['tokens']:,}개 토큰: "
+        f"{'모든 필드 일치' if result['ok'] else '불일치 있음 (kuromoji_parity.py 로 확인)'}")
+
+
+# ══════════════════════════════════════════════════════════
+# 비교
+# ══════════════════════════════════════════════════════════
+def compare(current, baseline, threshold):
+    """기준 대비 변화 출력. 회귀(또는 checks 불일치)가 있으면 True"""
+    regressed = False
+    base_metrics = baseline.get("metrics", {})
+    print(f"{'metric':<48} {'baseline':>12} {'current':>12} {'change':>9}")
+    print("─" * 84)
+    for name, value in current["metrics"].items():
+        base = base_metrics.get(name)
+        if base is None or value is None:
+            print(f"{name:<48} {'-':>12} {value:>12.3f}")
+            continue
+        change = (value - base) / base if base else 0.0
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        mark = ""
+        if worse > threshold:
+            mark, regressed = "  ✗ 회귀", True
+        elif worse < -threshold:
+            mark = "  ✓ 개선"
+        print(f"{name:<48} {base:>12.3f} {value:>12.3f} {change:>+8.1%}{mark}")
+
+    for name, value in current.get("checks", {}).items():
+        base = baseline.get("checks", {}).get(name)
+        if base is not None and base != value:
+            print(f"{name:<48} {str(base):>12} {str(value):>12}  ≠ 동작 변화")
+            regressed = True
+    return regressed
+
+
+# ══════════════════════════════════════════════════════════
+# 메인
+# ══════════════════════════════════════════════════════════
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tangoya 성능 벤치마크")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (기본: 표준출력)")
+    parser.add_argument("--compare", metavar="BASELINE", help="기준 결과 JSON 과 비교")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="회귀로 판단할 변화율 (기본: 0.10 = 10%%)")
+    parser.add_argument("--only", help=f"측정 항목 (쉼표 구분: {','.join(SECTIONS)})")
+    parser.add_argument("--clients", type=int, default=16, help="serve 동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=3.0, help="serve 경로당 측정 시간(초)")
+    parser.add_argument("--repeat", type=int, default=3, help="build / cold 반복 횟수")
+    parser.add_argument("--long", action="store_true",
+                        help="analysis 에 장문 케이스(10,000 / 50,000 토큰) 추가")
+    args = parser.parse_args()
+
+    sections = args.only.split(",") if args.only else SECTIONS
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+
+    metrics, checks = {}, {}
+    sandbox = make_sandbox() if {"build", "cold"} & set(sections) else None
+    try:
+        if "build" in sections:
+            log("[build] build_html.py --force (임시 복사본)")
+            bench_build(metrics, args.repeat, sandbox)
+        if "dict" in sections:
+            log("[dict] jlpt_dict.json")
+            bench_dict(metrics)
+        if "serve" in sections:
+            log(f"[serve] 동시 클라이언트 {args.clients}개 × 경로당 {args.duration:g}초")
+            bench_serve(metrics, checks, args.clients, args.duration)
+        if "cold" in sections:
+            log("[cold] start_server.py → tangoya.html 첫 바이트 (임시 복사본)")
+            bench_cold(metrics, checks, args.repeat, sandbox)
+    finally:
+        if sandbox:
+            shutil.rmtree(sandbox, ignore_errors=True)
+    if "analysis" in sections:
+        log("[analysis] lookupWord / autoMergeCustomWords (Node.js)")
+        bench_analysis(metrics, checks, ANALYSIS_CASES_LONG if args.long else ANALYSIS_CASES)
+    if "parity" in sections:
+        log("[parity] kuromoji_engine.py ↔ kuromoji.js")
+        bench_parity(metrics, checks)
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git":       git_revision(),
+            "python":    platform.python_version(),
+            "platform":  platform.platform(),
+            "cpus":      os.cpu_count(),
+            "sections":  sections,
+        },
+        "metrics": metrics,
+        "checks":  checks,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        log(f"  ✓ 저장: {args.output}")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
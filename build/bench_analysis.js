@@ -0,0 +1,183 @@
+// bench_analysis.js — tangoya_template.html 의 분석 함수 벤치마크 (Node.js)
+// build/bench.py 가 호출합니다. 단독 실행:
+//   node build/bench_analysis.js '{"template": "...", "dict": "...", "cases": [[500, 100]]}'
+//
+// 템플릿에서 사전 조회·커스텀 병합 함수 선언을 그대로 잘라 와 실행하므로
+// 브라우저 코드가 바뀌면 벤치마크도 자동으로 새 구현을 측정합니다.
+// 결과는 JSON 한 줄로 표준출력에 씁니다.
+
+'use strict';
+const fs = require('fs');
+const vm = require('vm');
+const { performance } = require('perf_hooks');
+
+const opts = JSON.parse(process.argv[2] || '{}');
+const html = fs.readFileSync(opts.template, 'utf8');
+
+// 템플릿에서 가져올 최상위 선언 (없는 이름은 건너뜀 — 구현이 바뀌어도 동작)
+const DECLS = [
+  'REGEX', 'GRAMMAR_POS', 'LEVEL_RANK',
+  'toKatakana', 'toHiragana',
+  'lowerLevel', 'resolveLookupKey', 'lookupKey', 'lookupWord',
+  'indexLookupKeys', 'loadJlptDict', 'refreshLookup',
+  'buildCustomTrie', 'autoMergeCustomWords', 'toAppToken',
+];
+
+// ── 선언 잘라내기: "function NAME(" 또는 "const NAME =" 부터 짝이 맞는 괄호까지 ──
+function extractDecl(name) {
+  const re = new RegExp(`\\n(\\s*)((?:async\\s+)?function\\s+${name}\\s*\\(|(?:const|let)\\s+${name}\\s*=)`);
+  const m = re.exec(html);
+  if (!m) return null;
+  const start = m.index + 1;
+  const isFunc = /function/.test(m[2]);
+  // 함수는 인자 목록의 '(' 부터 괄호 깊이를 센다
+  let i = html.indexOf(m[2], start) + m[2].length - (isFunc ? 1 : 0);
+  // 함수는 본문 '{', 상수는 ';' 또는 줄 끝까지 (객체/배열 리터럴은 괄호 짝 맞춤)
+  let depth = 0;
+  let seenBody = false;
+  for (; i < html.length; i++) {
+    const ch = html[i];
+    if (ch === '\'' || ch === '"' || ch === '`') {
+      // 문자열 건너뛰기
+      for (i++; i < html.length && html[i] !== ch; i++) if (html[i] === '\\') i++;
+      continue;
+    }
+    if (ch === '/' && html[i + 1] === '/') { i = html.indexOf('\n', i) - 1; continue; }
+    if (ch === '/' && html[i + 1] === '*') { i = html.indexOf('*/', i) + 1; continue; }
+    if (ch === '{' || ch === '[' || ch === '(') {
+      depth++;
+      if (ch === '{') seenBody = true;
+    } else if (ch === '}' || ch === ']' || ch === ')') {
+      depth--;
+      if (depth === 0 && isFunc && ch === '}' && seenBody) return html.slice(start, i + 1);
+    } else if (!isFunc && depth === 0 && (ch === ';' || ch === '\n')) {
+      return html.slice(start, i + 1);
+    }
+  }
+  return null;
+}
+
+const found = [];
+const source = [
+  'let JLPT_DICT = {};',
+  'const JLPT_LOOKUP = Object.create(null);',
+  'const LOOKUP_DEPS = Object.create(null);',
+];
+for (const name of DECLS) {
+  const decl = extractDecl(name);
+  if (decl) { source.push(decl); found.push(name); }
+}
+source.push('({ loadJlptDict, lookupWord, autoMergeCustomWords, toHiragana, ' +
+            `toAppToken: ${found.includes('toAppToken') ? 'toAppToken' : 'null'}, ` +
+            'getDict: () => JLPT_DICT });');
+const ctx = vm.createContext({ console });
+const api = vm.runInContext(source.join('\n'), ctx);
+
+// ── 결정적 난수 (mulberry32) ──────────────────────────────
+function rng(seed) {
+  return () => {
+    seed |= 0; seed = seed + 0x6D2B79F5 | 0;
+    let t = Math.imul(seed ^ seed >>> 15, 1 | seed);
+    t = t + Math.imul(t ^ t >>> 7, 61 | t) ^ t;
+    return ((t ^ t >>> 14) >>> 0) / 4294967296;
+  };
+}
+
+function timeIt(fn, minMs = 200, maxRuns = 50) {
+  // 최소 minMs 동안 반복 실행 후 1회 중앙값(ms)
+  const runs = [];
+  const until = performance.now() + minMs;
+  do {
+    const t0 = performance.now();
+    fn();
+    runs.push(performance.now() - t0);
+  } while (performance.now() < until && runs.length < maxRuns);
+  runs.sort((a, b) => a - b);
+  return { median_ms: runs[runs.length >> 1], runs: runs.length };
+}
+
+const results = {};
+
+// ── 1. jlpt_dict.json 파싱 + 적용 ─────────────────────────
+const raw = fs.readFileSync(opts.dict, 'utf8');
+results.dict_parse_ms = timeIt(() => JSON.parse(raw)).median_ms;
+let t0 = performance.now();
+api.loadJlptDict(JSON.parse(raw));
+results.dict_load_ms = performance.now() - t0;
+
+const dict = api.getDict();
+const keys = Object.keys(dict);
+const PARTICLES = [
+  ['は', '助詞'], ['が', '助詞'], ['を', '助詞'], ['に', '助詞'], ['の', '助詞'],
+  ['です', '助動詞'], ['た', '助動詞'], ['、', '記号'], ['。', '記号'],
+];
+
+// ── 2. 합성 텍스트 토큰 + 커스텀 단어 ─────────────────────
+function makeTokens(n, rand) {
+  const tokens = [];
+  for (let i = 0; i < n; i++) {
+    if (rand() < 0.4) {
+      const [s, pos] = PARTICLES[Math.floor(rand() * PARTICLES.length)];
+      tokens.push({ surface_form: s, basic_form: s, reading: s, pos, pos_detail_1: '*' });
+    } else {
+      const key = keys[Math.floor(rand() * keys.length)];
+      // 사전에 없는 활용형/미등록어도 섞음
+      const surface = rand() < 0.15 ? key + 'っ' : key;
+      tokens.push({ surface_form: surface, basic_form: key, reading: dict[key].r || '*',
+                    pos: '名詞', pos_detail_1: '一般' });
+    }
+  }
+  return tokens;
+}
+
+function toAppTokens(kuroTokens) {
+  // processTokens ②③ 과 같은 변환 (lookupWord 호출 포함) — 템플릿에 toAppToken 이 있으면 그대로 사용
+  if (api.toAppToken) return kuroTokens.map((t, i) => Object.assign(api.toAppToken(t), { _origIdx: i }));
+  return kuroTokens.map((t, i) => {
+    const surface  = t.surface_form;
+    const baseForm = (t.basic_form && t.basic_form !== '*') ? t.basic_form : surface;
+    const reading  = api.toHiragana((t.reading && t.reading !== '*') ? t.reading : surface);
+    const info = api.lookupWord(surface, baseForm, reading);
+    return { surface, baseForm, reading, pos: t.pos, posDetail: t.pos_detail_1,
+             level: info ? info.l : '外', korean: info ? info.k : '-', _origIdx: i };
+  });
+}
+
+function makeCustomWords(tokens, count, rand) {
+  const map = {};
+  for (let c = 0; Object.keys(map).length < count && c < count * 10; c++) {
+    // 본문에 실제로 나오는 2~4 토큰 연속 구간 (일부는 본문에 없는 단어)
+    const len = 2 + Math.floor(rand() * 3);
+    const at = Math.floor(rand() * Math.max(1, tokens.length - len));
+    let surface = tokens.slice(at, at + len).map(t => t.surface).join('');
+    if (rand() < 0.2) surface += '語';
+    map[surface] = { surface, reading: surface, pos: '名詞', level: 'N3', korean: '커스텀' };
+  }
+  return map;
+}
+
+results.cases = [];
+for (const [nTokens, nCustom] of opts.cases || [[500, 100]]) {
+  const rand = rng(nTokens * 7919 + nCustom);
+  const kuro = makeTokens(nTokens, rand);
+  const appTokens = toAppTokens(kuro);
+  const customMap = makeCustomWords(appTokens, nCustom, rand);
+
+  const lookup = timeIt(() => toAppTokens(kuro), 300, 1000);
+  let merged = null;
+  const merge = timeIt(() => {
+    merged = api.autoMergeCustomWords(appTokens.map(tk => Object.assign({}, tk)), customMap);
+  }, opts.merge_min_ms || 200, opts.merge_max_runs || 20);
+
+  results.cases.push({
+    tokens: nTokens,
+    custom_words: Object.keys(customMap).length,
+    lookup_ms: lookup.median_ms,
+    lookup_tokens_per_s: nTokens / (lookup.median_ms / 1000),
+    merge_ms: merge.median_ms,
+    merged_tokens: merged.length,
+  });
+}
+
+results.functions = found;
+process.stdout.write(JSON.stringify(results) + '\n');
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+build_assets.py  —  배포용 에셋 번들 생성 (사전 압축 + 내용 해시 파일명)
+실행: cd tangoya && python3 build/build_assets.py [--force]
+      (build_html.py 가 마지막 단계로 자동 실행합니다)
+
+처리 흐름:
+  1. jlpt_dict.json, kuromoji.js → dist/bundle/<이름>.<해시10자리>.<확장자>
+     (내용이 바뀌면 파일명이 바뀌므로 브라우저가 재검증 없이 영구 캐시)
+     fonts/fonts.css 는 참조하는 woff2 가 모두 있을 때만 번들 (url 을 ../fonts/ 로 바꿔 복사)
+     → 페이지가 Google Fonts 대신 로컬 폰트를 쓰고, woff2 도 오프라인 캐시 대상에 추가
+  2. 번들 파일과 tangoya.html / jlpt_dict.json / kuromoji.js / fonts/fonts.css 옆에
+     .gz (항상) / .br (brotli 모듈이 있을 때) 사전 압축본 생성
+     → start_server.py 가 Accept-Encoding 에 맞춰 그대로 전송
+  3. dist/bundle/manifest.json 저장
+     {"assets":  {원래이름: 번들경로},        페이지가 실제로 불러올 파일
+      "offline": [경로, ...]}                 서비스 워커(sw.js)가 미리 캐시할 파일
+  4. 매니페스트에 없는 이전 번들 파일 삭제
+
+사전 압축본은 원본보다 mtime 이 오래되면 서버가 무시하므로
+build_html.py 만 다시 실행해도 오래된 압축본이 전송되지는 않습니다.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+try:
+    import brotli          # 선택 의존성: pip install brotli
+except ImportError:
+    brotli = None
+
+# ── 경로 설정 ──────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR   = os.path.dirname(SCRIPT_DIR)          # tangoya/
+DIST_DIR   = os.path.join(BASE_DIR, "dist")
+BUNDLE_DIR = os.path.join(DIST_DIR, "bundle")
+BUNDLE_MANIFEST_PATH = os.path.join(BUNDLE_DIR, "manifest.json")
+
+# 내용 해시 파일명으로 번들에 복사할 파일 (dist 기준 상대 경로)
+HASHED_ASSETS = ["jlpt_dict.json", "kuromoji.js"]
+# 고정 파일명 그대로 사전 압축본만 만드는 파일
+SIDECAR_ASSETS = ["tangoya.html", "jlpt_dict.json", "kuromoji.js", "fonts/fonts.css"]
+# 서비스 워커가 미리 캐시할 고정 파일 (번들 파일·사전 파일·woff2 는 자동 추가)
+OFFLINE_ASSETS = ["tangoya.html", "kuromoji-worker.js"]
+# 로컬 폰트 (asset_fetcher.download_fonts 가 생성: url('<파일명>.woff2') 형식)
+FONTS_CSS   = "fonts/fonts.css"
+FONT_URL_RE = re.compile(r"url\('([^'/]+\.woff2)'\)")
+
+HASH_LEN       = 10
+GZIP_LEVEL     = 9
+BROTLI_QUALITY = 11
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LEN]
+
+
+def hashed_name(rel, digest):
+    """jlpt_dict.json → jlpt_dict.<digest>.json"""
+    stem, ext = os.path.splitext(os.path.basename(rel))
+    return f"{stem}.{digest}{ext}"
+
+
+def write_bytes(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def compress_variants(path, data, force=False):
+    """path.gz / path.br 생성. 원본보다 새로운 압축본이 있으면 생략. 만든 확장자 목록 반환"""
+    src_mtime = os.path.getmtime(path)
+    encoders = [(".gz", lambda d: gzip.compress(d, compresslevel=GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda d: brotli.compress(d, quality=BROTLI_QUALITY)))
+    made = []
+    for suffix, encode in encoders:
+        out = path + suffix
+        if force or not os.path.exists(out) or os.path.getmtime(out) < src_mtime:
+            write_bytes(out, encode(data))
+        made.append(suffix)
+    return made
+
+
+def _rel_dist(path):
+    return os.path.relpath(path, DIST_DIR).replace(os.sep, "/")
+
+
+def _size_line(path, suffixes):
+    raw = os.path.getsize(path)
+    parts = [f"{raw / 1024:,.1f} KB"]
+    for suffix in suffixes:
+        parts.append(f"{suffix[1:]} {os.path.getsize(path + suffix) / 1024:,.1f} KB")
+    return " / ".join(parts)
+
+
+def local_fonts_css():
+    """(번들용 fonts.css bytes, woff2 상대 경로 목록). fonts.css 가 없거나 woff2 가 하나라도 없으면 None
+    — 번들은 bundle/ 에 있으므로 woff2 경로를 ../fonts/ 로 바꿈"""
+    try:
+        with open(os.path.join(DIST_DIR, FONTS_CSS), "r", encoding="utf-8") as f:
+            css_text = f.read()
+    except OSError:
+        return None
+    names = sorted(set(FONT_URL_RE.findall(css_text)))
+    if not names or not all(os.path.exists(os.path.join(DIST_DIR, "fonts", n)) for n in names):
+        return None
+    css_text = FONT_URL_RE.sub(lambda m: f"url('../fonts/{m.group(1)}')", css_text)
+    return css_text.encode("utf-8"), [f"fonts/{n}" for n in names]
+
+
+def _bundle_file(rel, data, force, keep, assets):
+    """data 를 bundle/<이름>.<해시>.<확장자> 로 저장·압축하고 assets[rel] 에 기록"""
+    name = hashed_name(rel, content_hash(data))
+    dest = os.path.join(BUNDLE_DIR, name)
+    if force or not os.path.exists(dest):
+        write_bytes(dest, data)
+    suffixes = compress_variants(dest, data, force)
+    keep.update([name] + [name + s for s in suffixes])
+    assets[rel] = _rel_dist(dest)
+    print(f"  ✓  {rel} → bundle/{name} ({_size_line(dest, suffixes)})")
+
+
+def build(force=False):
+    """번들 생성 후 매니페스트 dict 반환"""
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    assets = {}
+    keep   = {os.path.basename(BUNDLE_MANIFEST_PATH)}
+
+    # ── 1. 내용 해시 번들 ──────────────────────────────
+    for rel in HASHED_ASSETS:
+        src = os.path.join(DIST_DIR, rel)
+        if not os.path.exists(src):
+            print(f"  –  {rel}: 없음 (생략)")
+            continue
+        with open(src, "rb") as f:
+            data = f.read()
+        _bundle_file(rel, data, force, keep, assets)
+
+    fonts = local_fonts_css()
+    font_files = []
+    if fonts:
+        data, font_files = fonts
+        _bundle_file(FONTS_CSS, data, force, keep, assets)
+    else:
+        print(f"  –  {FONTS_CSS}: woff2 없음 (Google Fonts 사용)")
+
+    # ── 2. 고정 파일명 사전 압축본 ─────────────────────
+    for rel in SIDECAR_ASSETS:
+        src = os.path.join(DIST_DIR, rel)
+        if not os.path.exists(src):
+            continue
+        with open(src, "rb") as f:
+            data = f.read()
+        suffixes = compress_variants(src, data, force)
+        print(f"  ✓  {rel} ({_size_line(src, suffixes)})")
+
+    # ── 3. 매니페스트 ──────────────────────────────────
+    dict_dir = os.path.join(DIST_DIR, "dict")
+    dict_files = sorted(f"dict/{n}" for n in os.listdir(dict_dir) if n.endswith(".dat.gz")) \
+        if os.path.isdir(dict_dir) else []
+    offline = [rel for rel in OFFLINE_ASSETS if os.path.exists(os.path.join(DIST_DIR, rel))]
+    manifest = {
+        "version": 1,
+        "assets":  assets,
+        "offline": offline + sorted(assets.values()) + dict_files + font_files,
+    }
+    write_bytes(BUNDLE_MANIFEST_PATH,
+                json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    # ── 4. 이전 번들 정리 ──────────────────────────────
+    removed = 0
+    for name in os.listdir(BUNDLE_DIR):
+        if name not in keep:
+            os.remove(os.path.join(BUNDLE_DIR, name))
+            removed += 1
+    if removed:
+        print(f"  –  이전 번들 파일 {removed}개 삭제")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tangoya 에셋 번들 생성 (사전 압축 + 해시 파일명)")
+    parser.add_argument("--force", action="store_true", help="기존 번들·압축본이 있어도 다시 생성")
+    args = parser.parse_args()
+
+    print("=" * 56)
+    print("  tangoya build_assets.py")
+    print("=" * 56)
+    if brotli is None:
+        print("  (brotli 모듈 없음 — gzip 압축본만 생성합니다. pip install brotli)")
+    manifest = build(force=args.force)
+    print(f"\n  매니페스트 : {BUNDLE_MANIFEST_PATH}")
+    print(f"  오프라인 캐시 대상: {len(manifest['offline'])}개 파일")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
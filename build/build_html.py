@@ -1,23 +1,38 @@
 #!/usr/bin/env python3
 """
 build_html.py  —  tangoya 빌드 자동화 스크립트
-실행: cd tangoya && python3 build/build_html.py
+실행: cd tangoya && python3 build/build_html.py [--flat] [--force]
 
 처리 흐름:
-  1. data/N1~N5_words_naver.txt 읽기
-  2. data/korean_dict.json 로드
-  3. JLPT_DICT 생성 (한자키 + 히라가나키, r/l/k 포함)
-  4. dist/tangoya_template.html 읽기
-  5. // __JLPT_DICT_PLACEHOLDER__ → const JLPT_DICT = {...};
-  6. dist/tangoya.html 저장
-  7. 완료 통계 출력
+  1. 입력 파일 해시를 build/.build_manifest.json 과 비교 (변경 없으면 단계 생략)
+  2. data/N1~N5_words_naver.txt 읽기
+  3. data/korean_dict.json 로드
+  4. JLPT_DICT 생성 (한자키 + 히라가나키, r/l/k 포함)
+  5. dist/jlpt_dict.json 저장 (기본: 압축 포맷 v2, --flat: 키별 {r,l,k} 객체)
+  6. dist/tangoya_template.html → dist/tangoya.html
+  7. build_assets.py: gzip/brotli 사전 압축본 + 해시 파일명 번들 + bundle/manifest.json
+  8. 완료 통계 출력
+
+압축 포맷 (v2):
+  {"v": 2,
+   "e": [[r, l, k], ...],        중복 제거된 항목 테이블
+   "d": {키: 항목번호, ...},      JLPT_DICT 키 → 항목
+   "x": {조회키: 사전키, ...}}    빌드 시 해석된 조회 인덱스
+  "x" 에는 lookupWord 규칙('·' 분리, 카타카나 변환, 최저 급수 우선)으로
+  해석한 결과가 자기 자신이 아닌 키만 담깁니다 (카타카나 단어의 히라가나 표기 포함).
+  브라우저는 토큰 후보 키마다 한 번의 조회로 결과를 얻습니다.
 """
 
+import argparse
+import hashlib
 import json
 import os
+import re
 import sys
 from datetime import datetime
 
+import build_assets
+
 # ── 경로 설정 ──────────────────────────────────────────────
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR   = os.path.dirname(SCRIPT_DIR)          # tangoya/
@@ -31,19 +46,141 @@ WORD_FILES = [
     ("N2", os.path.join(DATA_DIR, "N2_words_naver.txt")),
     ("N1", os.path.join(DATA_DIR, "N1_words_naver.txt")),
 ]
-KOREAN_PATH  = os.path.join(DATA_DIR, "korean_dict.json")
+KOREAN_PATH   = os.path.join(DATA_DIR, "korean_dict.json")
 TEMPLATE_PATH = os.path.join(DIST_DIR, "tangoya_template.html")
 OUTPUT_PATH   = os.path.join(DIST_DIR, "tangoya.html")
-PLACEHOLDER   = "  // __JLPT_DICT_PLACEHOLDER__"
+DICT_PATH     = os.path.join(DIST_DIR, "jlpt_dict.json")
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, ".build_manifest.json")
 
+# 빌드 로직/포맷이 바뀌면 올려서 기존 매니페스트를 무효화
+BUILD_VERSION = 2
+DICT_FORMAT_VERSION = 2
+
+# ── lookupWord 규칙 (tangoya_template.html 과 동일) ────────
+LEVEL_RANK    = {"N5": 1, "N4": 2, "N3": 3, "N2": 4, "N1": 5, "外": 6, "文法": 7}
+DOT_SEPARATOR = re.compile(r"[·・]")
+HIRAGANA      = re.compile(r"[ぁ-ゖ]")
+KATAKANA      = re.compile(r"[ァ-ヶ]")
+
+
+def to_katakana(s):
+    return HIRAGANA.sub(lambda m: chr(ord(m.group()) + 0x60), s)
+
+
+def to_hiragana(s):
+    return KATAKANA.sub(lambda m: chr(ord(m.group()) - 0x60), s)
+
+
+def resolve_key(jlpt_dict, key):
+    """조회 키 1개를 lookupWord 규칙으로 해석 → 선택된 사전 키 (없으면 None)
+    직접 조회 → '·' 분리 부분 → 카타카나 변환 순, 급수가 더 낮을 때만 교체"""
+    best = None
+
+    def keep_lowest(k):
+        nonlocal best
+        if k not in jlpt_dict:
+            return
+        if best is None or (LEVEL_RANK.get(jlpt_dict[k]["l"], 9)
+                             < LEVEL_RANK.get(jlpt_dict[best]["l"], 9)):
+            best = k
+
+    keep_lowest(key)
+    if "·" in key or "・" in key:
+        for part in DOT_SEPARATOR.split(key):
+            if part:
+                keep_lowest(part)
+    kata = to_katakana(key)
+    if kata != key:
+        keep_lowest(kata)
+    return best
+
+
+def build_lookup_index(jlpt_dict):
+    """조회키 → 사전키. 결과가 자기 자신인 사전 키는 생략"""
+    keys = list(jlpt_dict)
+    for key in jlpt_dict:
+        hira = to_hiragana(key)
+        if hira != key and hira not in jlpt_dict:
+            keys.append(hira)
+    index = {}
+    for key in dict.fromkeys(keys):
+        winner = resolve_key(jlpt_dict, key)
+        if winner is not None and winner != key:
+            index[key] = winner
+    return index
+
+
+def compact_dict(jlpt_dict):
+    """{키: {r,l,k}} → 압축 포맷 v2"""
+    entries, entry_ids, keys = [], {}, {}
+    for key, entry in jlpt_dict.items():
+        row = (entry["r"], entry["l"], entry["k"])
+        if row not in entry_ids:
+            entry_ids[row] = len(entries)
+            entries.append(list(row))
+        keys[key] = entry_ids[row]
+    return {
+        "v": DICT_FORMAT_VERSION,
+        "e": entries,
+        "d": keys,
+        "x": build_lookup_index(jlpt_dict),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# 증분 빌드 매니페스트
+# ─────────────────────────────────────────────────────────────
+def file_hash(path):
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _rel(path):
+    return os.path.relpath(path, BASE_DIR).replace(os.sep, "/")
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == BUILD_VERSION else {}
 
-def main():
-    print("=" * 56)
-    print("  tangoya build_html.py")
-    print("=" * 56)
 
-    # ── STEP 1: N1~N5 단어 파일 읽기 ─────────────────────
-    print("\n[1/4] 단어 파일 로드 중...")
+def save_manifest(manifest):
+    manifest["version"] = BUILD_VERSION
+    tmp = MANIFEST_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def stage_stamp(inputs, options):
+    return {"inputs": {_rel(p): file_hash(p) for p in inputs}, "options": options}
+
+
+def stage_is_current(manifest, stage, stamp, outputs):
+    """입력 해시·옵션이 같고 출력 파일이 마지막 빌드 결과 그대로면 True"""
+    prev = manifest.get(stage)
+    if not prev or prev.get("inputs") != stamp["inputs"] or prev.get("options") != stamp["options"]:
+        return False
+    return all(prev.get("outputs", {}).get(_rel(p)) == file_hash(p) for p in outputs)
+
+
+def record_stage(manifest, stage, stamp, outputs):
+    manifest[stage] = dict(stamp, outputs={_rel(p): file_hash(p) for p in outputs})
+
+
+# ─────────────────────────────────────────────────────────────
+# 빌드 단계
+# ─────────────────────────────────────────────────────────────
+def load_word_data():
     word_data = []   # [(level, reading, kanji), ...]
     for level, fpath in WORD_FILES:
         if not os.path.exists(fpath):
@@ -51,7 +188,7 @@ def main():
             continue
         count = 0
         with open(fpath, "r", encoding="utf-8") as f:
-            for lineno, raw in enumerate(f, 1):
+            for raw in f:
                 line = raw.strip()
                 if not line:
                     continue
@@ -63,19 +200,20 @@ def main():
                 word_data.append((level, reading, kanji))
                 count += 1
         print(f"  {level}: {count}줄 읽음")
+    return word_data
+
 
-    # ── STEP 2: korean_dict.json 로드 ─────────────────────
-    print("\n[2/4] korean_dict.json 로드 중...")
+def load_korean_dict():
     if os.path.exists(KOREAN_PATH):
         with open(KOREAN_PATH, "r", encoding="utf-8") as f:
             korean_dict = json.load(f)
         print(f"  로드 완료: {len(korean_dict):,}개 항목")
-    else:
-        korean_dict = {}
-        print("  [WARNING] korean_dict.json 없음 — 한국어 뜻 없이 진행")
+        return korean_dict
+    print("  [WARNING] korean_dict.json 없음 — 한국어 뜻 없이 진행")
+    return {}
 
-    # ── STEP 3: JLPT_DICT 생성 ────────────────────────────
-    print("\n[3/4] JLPT_DICT 생성 중...")
+
+def build_jlpt_dict(word_data, korean_dict):
     jlpt_dict   = {}
     level_count = {lvl: 0 for lvl, _ in WORD_FILES}
 
@@ -96,40 +234,85 @@ def main():
         if reading != kanji and reading not in jlpt_dict:
             jlpt_dict[reading] = entry
 
-    total      = len(jlpt_dict)
-    has_korean = sum(1 for v in jlpt_dict.values()
-                     if v["k"] != "-" and v["k"])
-    missing    = total - has_korean
+    return jlpt_dict, level_count
 
-    print(f"  전체 항목: {total:,}개")
-    print(f"  레벨별 (한자키 기준):")
-    for lvl, _ in WORD_FILES:
-        print(f"    {lvl}: {level_count[lvl]:>5}개")
 
-    # JSON 직렬화 (minified)
-    dict_json = json.dumps(jlpt_dict, ensure_ascii=False, separators=(",", ":"))
+def write_text(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
 
-    # ── STEP 4~6: 템플릿 → HTML 출력 ─────────────────────
-    print("\n[4/4] HTML 빌드 중...")
-    if not os.path.exists(TEMPLATE_PATH):
-        print(f"  [ERROR] 템플릿 없음: {TEMPLATE_PATH}")
-        sys.exit(1)
 
-    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
-        template = f.read()
+def main():
+    parser = argparse.ArgumentParser(description="tangoya 빌드")
+    parser.add_argument("--flat", action="store_true",
+                        help="jlpt_dict.json 을 키별 {r,l,k} 객체(구 포맷)로 저장")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 전체 재빌드")
+    args = parser.parse_args()
+    dict_format = "flat" if args.flat else "compact"
 
-    if PLACEHOLDER not in template:
-        print(f"  [ERROR] 플레이스홀더 '{PLACEHOLDER}' 를 템플릿에서 찾을 수 없습니다.")
-        sys.exit(1)
+    print("=" * 56)
+    print("  tangoya build_html.py")
+    print("=" * 56)
+
+    manifest = {} if args.force else load_manifest()
+    dict_inputs = [p for _, p in WORD_FILES] + [KOREAN_PATH, os.path.abspath(__file__)]
+    dict_stamp  = stage_stamp(dict_inputs, {"format": dict_format})
+    html_stamp  = stage_stamp([TEMPLATE_PATH], {})
+
+    dict_current = stage_is_current(manifest, "dict", dict_stamp, [DICT_PATH])
+    html_current = stage_is_current(manifest, "html", html_stamp, [OUTPUT_PATH])
+
+    # ── STEP 1~4: 사전 빌드 ──────────────────────────────
+    if dict_current:
+        print("\n[1/5] 입력 변경 없음 — jlpt_dict.json 빌드 생략")
+        total = has_korean = None
+    else:
+        print("\n[1/5] 단어 파일 로드 중...")
+        word_data = load_word_data()
+
+        print("\n[2/5] korean_dict.json 로드 중...")
+        korean_dict = load_korean_dict()
+
+        print("\n[3/5] JLPT_DICT 생성 중...")
+        jlpt_dict, level_count = build_jlpt_dict(word_data, korean_dict)
+        total      = len(jlpt_dict)
+        has_korean = sum(1 for v in jlpt_dict.values() if v["k"] != "-" and v["k"])
+
+        print(f"  전체 항목: {total:,}개")
+        print(f"  레벨별 (한자키 기준):")
+        for lvl, _ in WORD_FILES:
+            print(f"    {lvl}: {level_count[lvl]:>5}개")
+
+        payload = jlpt_dict if args.flat else compact_dict(jlpt_dict)
+        if not args.flat:
+            print(f"  고유 항목: {len(payload['e']):,}개 / 조회 인덱스: {len(payload['x']):,}개")
+        write_text(DICT_PATH, json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        record_stage(manifest, "dict", dict_stamp, [DICT_PATH])
+
+    # ── STEP 4: 템플릿 → HTML 출력 ──────────────────────
+    if html_current:
+        print("\n[4/5] 템플릿 변경 없음 — tangoya.html 빌드 생략")
+    else:
+        print("\n[4/5] HTML 빌드 중...")
+        if not os.path.exists(TEMPLATE_PATH):
+            print(f"  [ERROR] 템플릿 없음: {TEMPLATE_PATH}")
+            sys.exit(1)
+        with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+            template = f.read()
+        # JLPT_DICT 는 페이지가 jlpt_dict.json 에서 비동기 로드하므로 템플릿을 그대로 출력
+        write_text(OUTPUT_PATH, template)
+        record_stage(manifest, "html", html_stamp, [OUTPUT_PATH])
 
-    # 플레이스홀더 → const JLPT_DICT = {...};
-    replacement = f"  const JLPT_DICT = {dict_json};"
-    output_html = template.replace(PLACEHOLDER, replacement, 1)
+    save_manifest(manifest)
 
-    os.makedirs(DIST_DIR, exist_ok=True)
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        f.write(output_html)
+    # ── STEP 5: 사전 압축 + 해시 파일명 번들 ─────────────
+    print("\n[5/5] 에셋 번들 생성 중 (build_assets.py)...")
+    build_assets.build(force=args.force)
 
+    dict_kb = os.path.getsize(DICT_PATH) / 1024
     file_kb = os.path.getsize(OUTPUT_PATH) / 1024
 
     # ── 완료 통계 출력 ────────────────────────────────────
@@ -138,7 +321,9 @@ def main():
     print("=" * 56)
     print("  빌드 완료")
     print("=" * 56)
-    print(f"  단어 데이터: {total:,}개 항목 내장 (한국어 뜻 포함: {has_korean:,}개)")
+    if total is not None:
+        print(f"  단어 데이터: {total:,}개 항목 (한국어 뜻 포함: {has_korean:,}개)")
+    print(f"  사전 파일  : {DICT_PATH} ({dict_kb:.1f} KB, {dict_format})")
     print(f"  출력 파일  : {OUTPUT_PATH}")
     print(f"  파일 크기  : {file_kb:.1f} KB")
     print(f"  빌드 완료  : {now}")
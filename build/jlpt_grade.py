@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+jlpt_grade.py  —  텍스트 코퍼스 JLPT 레벨 일괄 판정
+----------------------------------------------------
+브라우저의 processTokens() → lookupWord() 와 같은 규칙으로
+디렉터리 안의 텍스트 파일들을 형태소 분석하고, 문서별 레벨 히스토그램을
+JSON Lines 로 출력합니다.
+
+실행 방법:
+  python3 build/jlpt_grade.py <텍스트 폴더> [-o result.jsonl] [-j 4]
+
+옵션:
+  -o, --output   출력 파일 (기본: 표준출력)
+  -j, --jobs     워커 프로세스 수 (기본: CPU 코어 수)
+  --pattern      대상 파일 glob 패턴 (기본: *.txt, 하위 폴더 포함)
+  --tokens       문서별 토큰 목록(surface/baseForm/reading/pos/level/korean) 포함
+
+출력 (문서당 1줄):
+  {"file": "a/b.txt", "chars": 812, "tokens": 430,
+   "levels": {"N5": 120, "N4": 40, ..., "外": 12, "文法": 180}}
+
+워커는 시작 시 1회만 사전(jlpt_dict.json + Kuromoji 사전 캐시)을 로드합니다.
+"""
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import re
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import kuromoji_engine  # noqa: E402
+
+# ── 경로 설정 ──────────────────────────────────────────────
+BASE_DIR  = os.path.dirname(SCRIPT_DIR)
+DIST_DIR  = os.path.join(BASE_DIR, "dist")
+DICT_PATH = os.path.join(DIST_DIR, "jlpt_dict.json")
+
+# ── 브라우저(tangoya_template.html)와 동일한 상수 ──────────
+GRAMMAR_POS   = ["助詞", "助動詞", "記号", "接続詞"]
+LEVEL_RANK    = {"N5": 1, "N4": 2, "N3": 3, "N2": 4, "N1": 5, "外": 6, "文法": 7}
+LEVELS        = ["N5", "N4", "N3", "N2", "N1", "外", "文法"]
+DOT_SEPARATOR = re.compile(r"[·・]")
+HIRAGANA      = re.compile(r"[ぁ-ゖ]")
+KATAKANA      = re.compile(r"[ァ-ヶ]")
+
+
+def to_katakana(s):
+    """히라가나 → 카타카나 (toKatakana)"""
+    return HIRAGANA.sub(lambda m: chr(ord(m.group()) + 0x60), s)
+
+
+def to_hiragana(s):
+    """카타카나 → 히라가나 (toHiragana)"""
+    return KATAKANA.sub(lambda m: chr(ord(m.group()) - 0x60), s or "")
+
+
+def lookup_word(jlpt_dict, surface, base_form, reading):
+    """lookupWord: {r, l, k} 또는 None. 후보 중 가장 낮은 급수(N5 우선)를 반환"""
+    best = None
+
+    def keep_lowest(entry):
+        nonlocal best
+        if not entry:
+            return
+        if best is None or LEVEL_RANK.get(entry["l"], 9) < LEVEL_RANK.get(best["l"], 9):
+            best = entry
+
+    for key in (c for c in (base_form, surface, reading) if c):
+        # 1~3. 직접 조회
+        keep_lowest(jlpt_dict.get(key))
+        # 4. '·' '・' 포함 시 분리 후 각 부분 조회
+        if "·" in key or "・" in key:
+            for part in DOT_SEPARATOR.split(key):
+                if part:
+                    keep_lowest(jlpt_dict.get(part))
+        # 5. 카타카나 변환 후 재조회
+        kata = to_katakana(key)
+        if kata != key:
+            keep_lowest(jlpt_dict.get(kata))
+    return best
+
+
+def _field(token, name):
+    value = token.get(name)
+    return value if value and value != "*" else None
+
+
+def process_tokens(jlpt_dict, kuro_tokens):
+    """processTokens ②③: Kuromoji 원시 토큰 → 앱 토큰 (레벨/한국어 결정)"""
+    tokens = []
+    for t in kuro_tokens:
+        surface      = t["surface_form"]
+        base_form    = _field(t, "basic_form") or surface
+        reading_hira = to_hiragana(_field(t, "reading") or surface)
+        pos          = _field(t, "pos") or "不明"
+        pos_detail   = _field(t, "pos_detail_1") or ""
+
+        info = lookup_word(jlpt_dict, surface, base_form, reading_hira)
+        if pos in GRAMMAR_POS:
+            level, korean = "文法", "-"
+        elif info:
+            level, korean = info["l"], info["k"]
+        else:
+            level, korean = "外", "-"
+        tokens.append({
+            "surface": surface, "baseForm": base_form, "reading": reading_hira,
+            "pos": pos, "posDetail": pos_detail, "level": level, "korean": korean,
+        })
+    return tokens
+
+
+def load_jlpt_dict(path=DICT_PATH):
+    """jlpt_dict.json → {키: {r, l, k}} (압축 포맷 v2 는 항목 테이블을 펼침)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("v") != 2:
+        return data
+    entries = [{"r": r, "l": l, "k": k} for r, l, k in data["e"]]
+    return {key: entries[idx] for key, idx in data["d"].items()}
+
+
+# ─────────────────────────────────────────────────────────────
+# 멀티프로세스 워커
+# ─────────────────────────────────────────────────────────────
+_worker = {}
+
+
+def _init_worker(dict_path, cache_dir, with_tokens):
+    _worker["jlpt_dict"]   = load_jlpt_dict(dict_path)
+    _worker["tokenizer"]   = kuromoji_engine.Tokenizer(kuromoji_engine.Dictionaries(cache_dir))
+    _worker["with_tokens"] = with_tokens
+
+
+def grade_text(text, jlpt_dict, tokenizer):
+    """텍스트 1건 → (앱 토큰 목록, 레벨 히스토그램)"""
+    text = text.strip()
+    tokens = process_tokens(jlpt_dict, tokenizer.tokenize(text)) if text else []
+    levels = {lvl: 0 for lvl in LEVELS}
+    for tk in tokens:
+        levels[tk["level"]] = levels.get(tk["level"], 0) + 1
+    return tokens, levels
+
+
+def _grade_file(job):
+    path, rel = job
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file": rel, "error": str(e)}
+    tokens, levels = grade_text(text, _worker["jlpt_dict"], _worker["tokenizer"])
+    record = {"file": rel, "chars": len(text), "tokens": len(tokens), "levels": levels}
+    if _worker["with_tokens"]:
+        record["token_list"] = tokens
+    return record
+
+
+def iter_files(root, pattern):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if fnmatch.fnmatch(name, pattern):
+                path = os.path.join(dirpath, name)
+                yield path, os.path.relpath(path, root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 코퍼스 JLPT 레벨 일괄 판정")
+    parser.add_argument("input_dir", help="텍스트 파일 폴더")
+    parser.add_argument("-o", "--output", help="출력 JSONL 파일 (기본: 표준출력)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--tokens", action="store_true", help="토큰 목록 포함")
+    parser.add_argument("--dict", default=DICT_PATH, help="jlpt_dict.json 경로")
+    parser.add_argument("--kuromoji-dict", default=kuromoji_engine.DICT_DIR,
+                        help="Kuromoji dict/ 폴더 경로")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"[ERROR] 폴더 없음: {args.input_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    # 워커 시작 전에 부모에서 사전 캐시를 1회 준비 (워커는 mmap 만 수행)
+    cache_dir = kuromoji_engine.ensure_cache(args.kuromoji_dict)
+    init_args = (args.dict, cache_dir, args.tokens)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    try:
+        with multiprocessing.Pool(max(1, args.jobs), _init_worker, init_args) as pool:
+            for record in pool.imap(_grade_file, iter_files(args.input_dir, args.pattern),
+                                    chunksize=8):
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"  ✓ {count:,}개 문서 판정 완료", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
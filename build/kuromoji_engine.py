@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+kuromoji_engine.py  —  Kuromoji.js(v0.1.2) 호환 Python 형태소 분석기
+---------------------------------------------------------------------
+브라우저(kuromoji-worker.js)가 사용하는 dist/dict/*.dat.gz 를 그대로 읽어
+동일한 래티스 구성 · 비터비 탐색 결과(토큰 객체)를 생성합니다.
+
+사전 로드 방식:
+  1. 최초 1회 .dat.gz 를 build/.dict_cache/ 에 풀어 둡니다 (gz 크기/mtime 변경 시 재생성)
+  2. 이후에는 캐시 파일을 mmap 으로 열어 memoryview 배열로 사용합니다
+       base/check  → 더블 어레이 트라이 (int32)
+       cc          → 연접 비용 행렬 (int16)
+       tid, unk    → 토큰 정보 버퍼 (left_id, right_id, cost, pos_id)
+       tid_pos ... → 품사 문자열 버퍼
+       tid_map/unk_map → (offsets, values) int32 인덱스로 미리 변환
+  여러 워커 프로세스가 같은 캐시를 mmap 하므로 물리 메모리는 공유됩니다.
+
+사용 예:
+  from kuromoji_engine import load_tokenizer
+  tokenizer = load_tokenizer()
+  tokens = tokenizer.tokenize('今日は良い天気です。')
+"""
+
+import array
+import gzip
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from collections import namedtuple
+
+# ── 경로 설정 ──────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR   = os.path.dirname(SCRIPT_DIR)
+DICT_DIR   = os.path.join(BASE_DIR, "dist", "dict")
+CACHE_DIR  = os.path.join(SCRIPT_DIR, ".dict_cache")
+
+CACHE_VERSION = 1
+DICT_FILES = [
+    "base.dat.gz", "check.dat.gz", "cc.dat.gz",
+    "tid.dat.gz", "tid_pos.dat.gz", "tid_map.dat.gz",
+    "unk.dat.gz", "unk_pos.dat.gz", "unk_map.dat.gz",
+    "unk_char.dat.gz", "unk_compat.dat.gz", "unk_invoke.dat.gz",
+]
+# target map 은 캐시 생성 시 (offsets, values) 인덱스로 변환
+TARGET_MAPS = ["tid_map", "unk_map"]
+
+PUNCTUATION      = re.compile(r"、|。")
+DEFAULT_CATEGORY = "DEFAULT"
+NOT_FOUND        = -1
+
+_SHORT3 = struct.Struct("<hhh")
+_INT    = struct.Struct("<i")
+
+CharacterClass = namedtuple(
+    "CharacterClass",
+    "class_id class_name is_always_invoke is_grouping max_length",
+)
+
+
+# ─────────────────────────────────────────────────────────────
+# 캐시 (gz 해제 + mmap)
+# ─────────────────────────────────────────────────────────────
+def _source_stamp(dict_dir):
+    stamp = {}
+    for fname in DICT_FILES:
+        st = os.stat(os.path.join(dict_dir, fname))
+        stamp[fname] = [st.st_size, st.st_mtime_ns]
+    return stamp
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _build_target_index(raw):
+    """tid_map/unk_map 버퍼 → (offsets, values) int32 배열.
+    kuromoji 의 loadTargetMap 과 같이 범위를 벗어난 읽기는 0 으로 취급합니다."""
+    def read_int(pos):
+        return _INT.unpack_from(raw, pos)[0] if pos + 4 <= len(raw) else 0
+
+    mapping = {}
+    pos = 4  # map_keys_size (미사용)
+    while pos < len(raw):
+        key   = read_int(pos)
+        count = read_int(pos + 4)
+        pos  += 8
+        for _ in range(count):
+            mapping.setdefault(key, []).append(read_int(pos))
+            pos += 4
+
+    size    = (max(mapping) + 2) if mapping else 1
+    offsets = array.array("i", [0]) * size
+    values  = array.array("i")
+    for key in range(size - 1):
+        offsets[key] = len(values)
+        values.extend(mapping.get(key, ()))
+    offsets[size - 1] = len(values)
+    return offsets, values
+
+
+def ensure_cache(dict_dir=DICT_DIR, cache_dir=CACHE_DIR):
+    """캐시가 최신이 아니면 .dat.gz 를 풀어 다시 생성합니다.
+    멀티프로세스 사용 시에는 워커를 띄우기 전에 부모 프로세스에서 호출하세요."""
+    missing = [f for f in DICT_FILES if not os.path.exists(os.path.join(dict_dir, f))]
+    if missing:
+        raise FileNotFoundError(
+            f"Kuromoji 사전 파일 누락: {', '.join(missing)} "
+            f"(python3 build/download_offline_assets.py 로 다운로드)"
+        )
+
+    stamp    = {"version": CACHE_VERSION, "files": _source_stamp(dict_dir)}
+    manifest = os.path.join(cache_dir, "manifest.json")
+    if os.path.exists(manifest):
+        with open(manifest, "r", encoding="utf-8") as f:
+            try:
+                if json.load(f) == stamp:
+                    return cache_dir
+            except ValueError:
+                pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    for fname in DICT_FILES:
+        name = fname[:-len(".dat.gz")]
+        with gzip.open(os.path.join(dict_dir, fname), "rb") as f:
+            raw = f.read()
+        if name in TARGET_MAPS:
+            offsets, values = _build_target_index(raw)
+            _write_atomic(os.path.join(cache_dir, name + ".idx"), offsets.tobytes())
+            _write_atomic(os.path.join(cache_dir, name + ".val"), values.tobytes())
+        else:
+            _write_atomic(os.path.join(cache_dir, name + ".dat"), raw)
+
+    _write_atomic(manifest, json.dumps(stamp).encode("utf-8"))
+    return cache_dir
+
+
+def _map_file(path):
+    """파일을 읽기 전용 mmap 으로 엽니다 (빈 파일은 빈 bytes)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _typed(buf, fmt):
+    """리틀 엔디언 버퍼를 정수 배열 뷰로 변환합니다."""
+    if sys.byteorder == "little":
+        return memoryview(buf).cast(fmt)
+    arr = array.array(fmt, bytes(buf))
+    arr.byteswap()
+    return arr
+
+
+def _get_string(buf, index):
+    """NUL 종료 UTF-8 문자열 (ByteBuffer.getString)"""
+    end = buf.find(b"\x00", index)
+    if end < 0:
+        end = len(buf)
+    return bytes(buf[index:end]).decode("utf-8", errors="replace")
+
+
+def _js_length(s):
+    """JS String.length (UTF-16 코드 유닛 수)"""
+    return len(s) + sum(1 for ch in s if ord(ch) > 0xFFFF)
+
+
+# ─────────────────────────────────────────────────────────────
+# 사전 구성 요소
+# ─────────────────────────────────────────────────────────────
+class DoubleArrayTrie:
+    """base/check 더블 어레이 — doublearray.commonPrefixSearch 와 동일"""
+
+    def __init__(self, base, check):
+        self.base  = base
+        self.check = check
+
+    def _traverse(self, parent, code):
+        child = self.base[parent] + code
+        if 0 <= child < len(self.check) and self.check[child] == parent:
+            return child
+        return NOT_FOUND
+
+    def common_prefix_search(self, buf, start):
+        """buf[start:] 의 접두사 중 사전에 있는 것들의 [(trie_id, end), ...]"""
+        base   = self.base
+        result = []
+        parent = 0
+        for i in range(start, len(buf)):
+            child = self._traverse(parent, buf[i])
+            if child == NOT_FOUND:
+                break
+            parent = child
+            grand_child = self._traverse(child, 0)
+            if grand_child != NOT_FOUND:
+                b = base[grand_child]
+                result.append((-b - 1 if b <= 0 else None, i + 1))
+        return result
+
+
+class TargetMap:
+    """trie_id / class_id → token_info_id 목록"""
+
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values  = values
+
+    def get(self, key):
+        if key is None or not 0 <= key < len(self.offsets) - 1:
+            return ()
+        return self.values[self.offsets[key]:self.offsets[key + 1]]
+
+
+class TokenInfoDictionary:
+    """tid/unk 버퍼: token_info_id 위치에 left_id, right_id, cost, pos_id"""
+
+    def __init__(self, dictionary, pos_buffer, target_map):
+        self.dictionary = dictionary
+        self.pos_buffer = pos_buffer
+        self.target_map = target_map
+
+    def entry(self, token_info_id):
+        """(left_id, right_id, word_cost)"""
+        return _SHORT3.unpack_from(self.dictionary, token_info_id)
+
+    def get_features(self, token_info_id):
+        pos_id = _INT.unpack_from(self.dictionary, token_info_id + 6)[0]
+        return _get_string(self.pos_buffer, pos_id)
+
+
+class CharacterDefinition:
+    """unk_char / unk_invoke → 문자 카테고리"""
+
+    def __init__(self, category_map, invoke_buffer):
+        self.category_map = category_map
+        self.classes = []
+        self.lookup_table = {}
+        # 사전 파일은 0 으로 채워진 여유 공간을 포함하므로 실제 데이터 끝까지만 읽음
+        # (kuromoji 는 패딩까지 빈 이름의 클래스로 읽지만 참조되지 않음)
+        size = len(bytes(invoke_buffer).rstrip(b"\x00")) + 1
+        pos = 0
+        while pos + 1 < size:
+            is_always_invoke = invoke_buffer[pos]
+            is_grouping      = invoke_buffer[pos + 1]
+            max_length = (_INT.unpack_from(invoke_buffer, pos + 2)[0]
+                          if pos + 6 <= len(invoke_buffer) else 0)
+            end = invoke_buffer.find(b"\x00", pos + 6)
+            if end < 0:
+                end = len(invoke_buffer)
+            class_name = bytes(invoke_buffer[pos + 6:end]).decode("utf-8", errors="replace")
+            pos = end + 1
+            cls = CharacterClass(len(self.classes), class_name,
+                                 is_always_invoke, is_grouping, max_length)
+            self.lookup_table.setdefault(class_name, cls.class_id)
+            self.classes.append(cls)
+        self._cache = {}
+
+    def lookup(self, ch):
+        cls = self._cache.get(ch)
+        if cls is not None:
+            return cls
+        code = ord(ch)
+        if code > 0xFFFF:
+            # 서로게이트 페어 문자는 char.def 에 정의될 수 없으므로 DEFAULT
+            class_id = self.lookup_table.get(DEFAULT_CATEGORY)
+        else:
+            class_id = self.category_map[code]
+        cls = self.classes[class_id]
+        self._cache[ch] = cls
+        return cls
+
+
+class Dictionaries:
+    """DynamicDictionaries 대응: trie + 토큰 사전 + 연접 비용 + 미지어 사전"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        def mapped(name):
+            return _map_file(os.path.join(cache_dir, name))
+
+        def target_map(name):
+            return TargetMap(_typed(mapped(name + ".idx"), "i"),
+                             _typed(mapped(name + ".val"), "i"))
+
+        self.trie = DoubleArrayTrie(_typed(mapped("base.dat"), "i"),
+                                    _typed(mapped("check.dat"), "i"))
+        self.token_info_dictionary = TokenInfoDictionary(
+            mapped("tid.dat"), mapped("tid_pos.dat"), target_map("tid_map"))
+        self.connection_costs = _typed(mapped("cc.dat"), "h")
+        self.unknown_dictionary = TokenInfoDictionary(
+            mapped("unk.dat"), mapped("unk_pos.dat"), target_map("unk_map"))
+        self.character_definition = CharacterDefinition(
+            mapped("unk_char.dat"), mapped("unk_invoke.dat"))
+
+
+# ─────────────────────────────────────────────────────────────
+# 비터비 래티스
+# ─────────────────────────────────────────────────────────────
+class ViterbiNode:
+    __slots__ = ("name", "cost", "start_pos", "length", "left_id", "right_id",
+                 "prev", "surface_form", "shortest_cost", "type")
+
+    def __init__(self, name, cost, start_pos, length, type, left_id, right_id, surface_form):
+        self.name          = name
+        self.cost          = cost
+        self.start_pos     = start_pos
+        self.length        = length
+        self.left_id       = left_id
+        self.right_id      = right_id
+        self.prev          = None
+        self.surface_form  = surface_form
+        self.shortest_cost = 0 if type == "BOS" else float("inf")
+        self.type          = type
+
+
+class ViterbiLattice:
+    def __init__(self):
+        self.nodes_end_at = [[ViterbiNode(-1, 0, 0, 0, "BOS", 0, 0, "")]]
+        self.eos_pos = 1
+
+    def append(self, node):
+        last_pos = node.start_pos + node.length - 1
+        if self.eos_pos < last_pos:
+            self.eos_pos = last_pos
+        if last_pos >= len(self.nodes_end_at):
+            self.nodes_end_at.extend([None] * (last_pos + 1 - len(self.nodes_end_at)))
+        if self.nodes_end_at[last_pos] is None:
+            self.nodes_end_at[last_pos] = []
+        self.nodes_end_at[last_pos].append(node)
+
+    def append_eos(self):
+        self.eos_pos += 1
+        self.nodes_end_at.append([ViterbiNode(-1, 0, self.eos_pos, 0, "EOS", 0, 0, "")])
+
+    def nodes_at(self, index):
+        if 0 <= index < len(self.nodes_end_at):
+            return self.nodes_end_at[index]
+        return None
+
+
+class Tokenizer:
+    """kuromoji.js Tokenizer 와 동일한 토큰 객체(dict) 목록을 반환합니다."""
+
+    def __init__(self, dic):
+        self.dic = dic
+        costs = dic.connection_costs
+        self._cc = costs
+        self._backward_dimension = costs[1] if len(costs) > 1 else 0
+
+    @staticmethod
+    def split_by_punctuation(text):
+        sentences = []
+        tail = text
+        while tail:
+            m = PUNCTUATION.search(tail)
+            if not m:
+                sentences.append(tail)
+                break
+            sentences.append(tail[:m.start() + 1])
+            tail = tail[m.start() + 1:]
+        return sentences
+
+    def tokenize(self, text):
+        tokens = []
+        for sentence in self.split_by_punctuation(text):
+            self.tokenize_for_sentence(sentence, tokens)
+        return tokens
+
+    def tokenize_for_sentence(self, sentence, tokens=None):
+        if tokens is None:
+            tokens = []
+        best_path = self._search(self.build_lattice(sentence))
+        last_pos = tokens[-1]["word_position"] if tokens else 0
+        tid = self.dic.token_info_dictionary
+        unk = self.dic.unknown_dictionary
+        for node in best_path:
+            position = last_pos + node.start_pos
+            if node.type == "KNOWN":
+                features = tid.get_features(node.name).split(",")
+                tokens.append(_format_entry(node.name, position, node.type, features))
+            else:
+                features = unk.get_features(node.name).split(",")
+                tokens.append(_format_unknown_entry(node.name, position, node.type,
+                                                    features, node.surface_form))
+        return tokens
+
+    def build_lattice(self, sentence):
+        """ViterbiBuilder.build"""
+        lattice  = ViterbiLattice()
+        trie     = self.dic.trie
+        tid      = self.dic.token_info_dictionary
+        unk      = self.dic.unknown_dictionary
+        char_def = self.dic.character_definition
+
+        encoded = sentence.encode("utf-8")
+        offsets = []
+        offset  = 0
+        for ch in sentence:
+            offsets.append(offset)
+            offset += len(ch.encode("utf-8"))
+
+        n = len(sentence)
+        for pos in range(n):
+            start = offsets[pos]
+            vocabulary = trie.common_prefix_search(encoded, start)
+            for trie_id, end in vocabulary:
+                key = encoded[start:end].decode("utf-8", errors="replace")
+                length = _js_length(key)
+                for token_info_id in tid.target_map.get(trie_id):
+                    left_id, right_id, word_cost = tid.entry(token_info_id)
+                    lattice.append(ViterbiNode(token_info_id, word_cost, pos + 1, length,
+                                               "KNOWN", left_id, right_id, key))
+
+            head_char  = sentence[pos]
+            head_class = char_def.lookup(head_char)
+            if not vocabulary or head_class.is_always_invoke == 1:
+                key = head_char
+                grouped = False
+                if head_class.is_grouping == 1 and 1 < n - pos:
+                    for k in range(pos + 1, n):
+                        if char_def.lookup(sentence[k]).class_name != head_class.class_name:
+                            break
+                        key += sentence[k]
+                        grouped = True
+                # kuromoji 는 그룹화된 키의 길이만 UTF-16 단위로 계산함
+                length = _js_length(key) if grouped else 1
+                for unk_id in unk.target_map.get(head_class.class_id):
+                    left_id, right_id, word_cost = unk.entry(unk_id)
+                    lattice.append(ViterbiNode(unk_id, word_cost, pos + 1, length,
+                                               "UNKNOWN", left_id, right_id, key))
+
+        lattice.append_eos()
+        return lattice
+
+    def _search(self, lattice):
+        """ViterbiSearcher.search (forward → backward)"""
+        cc  = self._cc
+        dim = self._backward_dimension
+        for i in range(1, lattice.eos_pos + 1):
+            nodes = lattice.nodes_at(i)
+            if not nodes:
+                continue
+            for node in nodes:
+                prev_nodes = lattice.nodes_at(node.start_pos - 1)
+                if prev_nodes is None:
+                    continue
+                cost = float("inf")
+                shortest_prev = None
+                left_id = node.left_id
+                for prev in prev_nodes:
+                    total = prev.shortest_cost + cc[prev.right_id * dim + left_id + 2] + node.cost
+                    if total < cost:
+                        shortest_prev = prev
+                        cost = total
+                node.prev = shortest_prev
+                node.shortest_cost = cost
+
+        path = []
+        node_back = lattice.nodes_end_at[-1][0].prev
+        if node_back is None:
+            return []
+        while node_back.type != "BOS":
+            path.append(node_back)
+            if node_back.prev is None:
+                return []
+            node_back = node_back.prev
+        path.reverse()
+        return path
+
+
+# ─────────────────────────────────────────────────────────────
+# IpadicFormatter
+# ─────────────────────────────────────────────────────────────
+def _feature(features, i):
+    return features[i] if i < len(features) else None
+
+
+def _format_entry(word_id, position, type, features):
+    return {
+        "word_id":         word_id,
+        "word_type":       type,
+        "word_position":   position,
+        "surface_form":    _feature(features, 0),
+        "pos":             _feature(features, 1),
+        "pos_detail_1":    _feature(features, 2),
+        "pos_detail_2":    _feature(features, 3),
+        "pos_detail_3":    _feature(features, 4),
+        "conjugated_type": _feature(features, 5),
+        "conjugated_form": _feature(features, 6),
+        "basic_form":      _feature(features, 7),
+        "reading":         _feature(features, 8),
+        "pronunciation":   _feature(features, 9),
+    }
+
+
+def _format_unknown_entry(word_id, position, type, features, surface_form):
+    # 미지어 토큰에는 reading / pronunciation 키가 없음 (kuromoji.js 와 동일)
+    return {
+        "word_id":         word_id,
+        "word_type":       type,
+        "word_position":   position,
+        "surface_form":    surface_form,
+        "pos":             _feature(features, 1),
+        "pos_detail_1":    _feature(features, 2),
+        "pos_detail_2":    _feature(features, 3),
+        "pos_detail_3":    _feature(features, 4),
+        "conjugated_type": _feature(features, 5),
+        "conjugated_form": _feature(features, 6),
+        "basic_form":      _feature(features, 7),
+    }
+
+
+def load_tokenizer(dict_dir=DICT_DIR, cache_dir=CACHE_DIR):
+    """캐시를 준비하고 Tokenizer 를 반환합니다."""
+    ensure_cache(dict_dir, cache_dir)
+    return Tokenizer(Dictionaries(cache_dir))
+
+
+if __name__ == "__main__":
+    text = " ".join(sys.argv[1:]) or sys.stdin.read()
+    for token in load_tokenizer().tokenize(text):
+        print(json.dumps(token, ensure_ascii=False))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+kuromoji_parity.py  —  kuromoji_engine.py 와 kuromoji.js 토큰 비교 (모든 필드)
+-----------------------------------------------------------------------------
+같은 dist/dict/*.dat.gz 로 Python 엔진과 Node.js 의 kuromoji.js 를 실행해
+토큰 객체를 필드 단위로 비교합니다. 분할(surface_form 순서)뿐 아니라
+pos / pos_detail_* / conjugated_* / basic_form / reading / pronunciation 까지
+jlpt_grade.py 의 lookup_word · GRAMMAR_POS 판정에 쓰이는 값이 모두 같은지 확인합니다.
+
+실행 방법:
+  python3 build/kuromoji_parity.py                   # 합성 문장 300개
+  python3 build/kuromoji_parity.py -n 1000 --seed 7  # 개수·난수 시드 지정
+  python3 build/kuromoji_parity.py a.txt b.txt       # 텍스트 파일의 각 줄을 문장으로 사용
+  (bench.py --only parity 로도 실행됩니다)
+
+품사 버퍼(tid_pos.dat.gz)가 비어 있거나 손상된 사전이면 품사 필드를 비교할 수 없으므로
+일치 여부와 관계없이 실패로 처리합니다. 불일치가 있으면 종료 코드 1.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import kuromoji_engine  # noqa: E402
+from jlpt_grade import load_jlpt_dict  # noqa: E402
+
+# ── 경로 설정 ──────────────────────────────────────────────
+BASE_DIR    = os.path.dirname(SCRIPT_DIR)
+DIST_DIR    = os.path.join(BASE_DIR, "dist")
+KUROMOJI_JS = os.path.join(DIST_DIR, "kuromoji.js")
+
+FIELDS = [
+    "word_id", "word_type", "word_position", "surface_form",
+    "pos", "pos_detail_1", "pos_detail_2", "pos_detail_3",
+    "conjugated_type", "conjugated_form", "basic_form", "reading", "pronunciation",
+]
+MAX_EXAMPLES = 5
+
+PARTICLES = ["は", "が", "を", "に", "の", "で", "と", "も", "です", "ました", "ない", "て"]
+PUNCT     = ["、", "。", "！", "？", "「", "」"]
+
+# kuromoji.js 를 브라우저 빌드 그대로 실행 (XHR 로 사전 로드 → 파일 읽기로 대체)
+NODE_CODE = r"""
+const fs = require('fs');
+const opts = JSON.parse(fs.readFileSync(0, 'utf8'));
+global.window = global;
+global.XMLHttpRequest = function () {};
+XMLHttpRequest.prototype.open = function (method, url) { this.url = url; };
+XMLHttpRequest.prototype.send = function () {
+  const b = fs.readFileSync(this.url);
+  this.status = 200;
+  this.response = b.buffer.slice(b.byteOffset, b.byteOffset + b.length);
+  this.onload();
+};
+const kuromoji = require(opts.lib);
+kuromoji.builder({ dicPath: opts.dict }).build((err, tokenizer) => {
+  if (err) throw err;
+  process.stdout.write(JSON.stringify(opts.texts.map(t => tokenizer.tokenize(t))));
+});
+"""
+
+
+def synthetic_texts(count, seed):
+    """jlpt_dict.json 단어 + 조사·기호로 만든 결정적 문장 (미등록어·카타카나·숫자 포함)"""
+    words = sorted(load_jlpt_dict())
+    rand = random.Random(seed)
+    extras = ["コンピューター", "2024年", "ＡＢＣ", "abc", "東京都", "ｶﾀｶﾅ", "🍣", "　"]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rand.randint(3, 40)):
+            r = rand.random()
+            if r < 0.5:
+                parts.append(rand.choice(words))
+            elif r < 0.8:
+                parts.append(rand.choice(PARTICLES))
+            elif r < 0.93:
+                parts.append(rand.choice(PUNCT))
+            else:
+                parts.append(rand.choice(extras))
+        texts.append("".join(parts))
+    return texts
+
+
+def file_texts(paths):
+    texts = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            texts.extend(line.strip() for line in f if line.strip())
+    return texts
+
+
+def node_tokens(texts, dict_dir):
+    node = shutil.which("node")
+    if not node:
+        raise RuntimeError("node 를 찾을 수 없음")
+    opts = {"lib": KUROMOJI_JS, "dict": dict_dir.replace(os.sep, "/") + "/", "texts": texts}
+    out = subprocess.run([node, "-e", NODE_CODE], input=json.dumps(opts, ensure_ascii=False),
+                         capture_output=True, text=True, encoding="utf-8")
+    if out.returncode != 0:
+        lines = out.stderr.strip().splitlines()
+        raise RuntimeError("kuromoji.js 실행 실패" + (f": {lines[-1]}" if lines else ""))
+    return json.loads(out.stdout)
+
+
+def _normalize(token):
+    # JS 의 undefined 필드는 JSON 에서 빠지므로 Python 의 None 도 제외
+    return {k: v for k, v in token.items() if v is not None}
+
+
+def compare(texts, dict_dir=kuromoji_engine.DICT_DIR, cache_dir=kuromoji_engine.CACHE_DIR):
+    """두 구현의 토큰을 비교한 결과 dict"""
+    tokenizer = kuromoji_engine.load_tokenizer(dict_dir, cache_dir)
+    js_all = node_tokens(texts, dict_dir)
+    result = {
+        "texts": len(texts), "tokens": 0,
+        "segmentation_mismatches": 0,
+        "field_mismatches": {name: 0 for name in FIELDS},
+        "known_without_pos": 0,
+        "examples": [],
+    }
+    for text, js in zip(texts, js_all):
+        py = [_normalize(t) for t in tokenizer.tokenize(text)]
+        result["tokens"] += len(py)
+        result["known_without_pos"] += sum(1 for t in py
+                                           if t["word_type"] == "KNOWN" and not t.get("pos"))
+        if [t.get("surface_form") for t in py] != [t.get("surface_form") for t in js]:
+            result["segmentation_mismatches"] += 1
+            if len(result["examples"]) < MAX_EXAMPLES:
+                result["examples"].append({"text": text, "field": "segmentation",
+                                           "py": [t.get("surface_form") for t in py],
+                                           "js": [t.get("surface_form") for t in js]})
+            continue
+        for p, j in zip(py, js):
+            for name in FIELDS:
+                if p.get(name) != j.get(name):
+                    result["field_mismatches"][name] += 1
+                    if len(result["examples"]) < MAX_EXAMPLES:
+                        result["examples"].append({"text": text, "field": name,
+                                                   "py": p.get(name), "js": j.get(name)})
+            extra = set(p) ^ set(j)
+            if extra and len(result["examples"]) < MAX_EXAMPLES:
+                result["examples"].append({"text": text, "field": "keys", "py": sorted(p),
+                                           "js": sorted(j)})
+    result["ok"] = (result["segmentation_mismatches"] == 0
+                    and not any(result["field_mismatches"].values())
+                    and result["known_without_pos"] == 0)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="kuromoji_engine.py ↔ kuromoji.js 토큰 비교")
+    parser.add_argument("files", nargs="*", help="비교할 텍스트 파일 (각 줄이 문장, 없으면 합성 문장)")
+    parser.add_argument("-n", "--count", type=int, default=300, help="합성 문장 수 (기본: 300)")
+    parser.add_argument("--seed", type=int, default=1, help="합성 문장 난수 시드")
+    args = parser.parse_args()
+
+    texts = file_texts(args.files) if args.files else synthetic_texts(args.count, args.seed)
+    try:
+        result = compare(texts)
+    except (OSError, RuntimeError) as e:
+        print(f"  ✗ {e}", file=sys.stderr)
+        return 1
+
+    print("=" * 56)
+    print("  kuromoji_engine.py ↔ kuromoji.js")
+    print("=" * 56)
+    print(f"  문장 {result['texts']}개 / 토큰 {result['tokens']:,}개")
+    print(f"  분할 불일치 : {result['segmentation_mismatches']}개 문장")
+    for name, n in result["field_mismatches"].items():
+        if n:
+            print(f"  {name:<16}: {n}개 토큰 불일치")
+    if result["known_without_pos"]:
+        print(f"  ✗ 품사 없는 사전 토큰 {result['known_without_pos']}개 "
+              f"— tid_pos.dat.gz 가 비어 있거나 손상됨 (품사 필드 비교 불가)")
+    for ex in result["examples"]:
+        print(f"    · [{ex['field']}] {ex['text'][:40]!r}\n        py {ex['py']}\n        js {ex['js']}")
+    print(f"\n  {'✓ 모든 필드 일치' if result['ok'] else '✗ 불일치 있음'}")
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,10 @@ a = Analysis(
     binaries=[],
     datas=[],          # 에셋은 런타임에 .app 옆 폴더에서 읽음
     hiddenimports=[
+        'asset_fetcher',
+        'concurrent.futures',
+        'gzip',
+        'hashlib',
         'http.server',
         'urllib.request',
         'urllib.error',
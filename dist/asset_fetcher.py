@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+asset_fetcher.py — tangoya 에셋 다운로드 / 검증 공용 모듈
+--------------------------------------------------------
+dist/start_server.py (자동 설치) 와 build/download_offline_assets.py (수동 준비) 가
+함께 사용합니다.
+
+  - 동시 다운로드: 최대 MAX_WORKERS 개 스레드
+  - 이어받기: 받다 만 파일은 <이름>.part 로 남고, 다음 시도에서 Range 요청으로 이어서 받음
+  - 원자적 저장: 크기 확인이 끝난 .part 만 최종 파일명으로 rename
+  - 매니페스트: dist/assets_manifest.json 에 파일별 크기·SHA-256 기록.
+    check_assets() 가 이 값으로 잘린/손상된 파일을 찾아냄
+
+URL 상수(KUROMOJI_JS_URL 등)를 바꾸면 로컬 미러 서버로도 받을 수 있습니다.
+"""
+
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ─────────────────────────────────────────────────────────────
+# 에셋 URL 설정
+# ─────────────────────────────────────────────────────────────
+KUROMOJI_VERSION   = '0.1.2'
+KUROMOJI_JS_URL    = f'https://cdn.jsdelivr.net/npm/kuromoji@{KUROMOJI_VERSION}/build/kuromoji.js'
+KUROMOJI_DICT_BASE = f'https://cdn.jsdelivr.net/npm/kuromoji@{KUROMOJI_VERSION}/dict'
+
+DICT_FILES = [
+    'base.dat.gz', 'cc.dat.gz', 'check.dat.gz',
+    'tid.dat.gz', 'tid_map.dat.gz', 'tid_pos.dat.gz',
+    'unk.dat.gz', 'unk_char.dat.gz', 'unk_compat.dat.gz',
+    'unk_invoke.dat.gz', 'unk_map.dat.gz', 'unk_pos.dat.gz',
+]
+
+# Google Fonts CSS URL (모든 weight 포함)
+GOOGLE_FONTS_CSS_URL = (
+    'https://fonts.googleapis.com/css2?'
+    'family=Noto+Serif+JP:wght@400;700'
+    '&family=Noto+Sans+KR:wght@300;400;500;700'
+    '&family=DM+Mono:wght@400;500'
+    '&display=swap'
+)
+
+# User-Agent: 최신 Chrome (Google Fonts API 응답에 woff2 포함하도록)
+UA = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+
+MANIFEST_NAME    = 'assets_manifest.json'
+MANIFEST_VERSION = 1
+MAX_WORKERS      = 6     # 동시 다운로드 수 (브라우저의 호스트당 연결 수와 같음)
+RETRIES          = 3     # 파일당 시도 횟수 (실패 시 .part 에서 이어받기)
+RETRY_BACKOFF    = 1.0   # 재시도 대기(초) — 시도마다 2배 (1초, 2초, ...)
+RETRY_STATUSES   = (408, 429)   # 재시도하는 4xx (그 외 4xx 는 재시도해도 같음)
+TIMEOUT          = 60
+CHUNK_SIZE       = 65536
+
+# 다운로드 중 네트워크 오류로 취급하는 예외 (URLError 는 OSError 하위 클래스)
+FETCH_ERRORS = (OSError, http.client.HTTPException)
+
+
+# ─────────────────────────────────────────────────────────────
+# 매니페스트 (크기 / SHA-256)
+# ─────────────────────────────────────────────────────────────
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _looks_complete(path):
+    """매니페스트에 없는 기존 파일(이전 버전에서 받은 것)의 잘림 여부를 파일 형식으로 확인"""
+    try:
+        if path.endswith('.gz'):
+            # gzip 트레일러의 CRC·길이까지 읽어야 끝까지 받은 파일
+            with gzip.open(path, 'rb') as f:
+                while f.read(1 << 20):
+                    pass
+            return True
+        if path.endswith('.woff2'):
+            # WOFF2 헤더: 'wOF2' 시그니처 + 8바이트 위치에 전체 길이
+            with open(path, 'rb') as f:
+                header = f.read(12)
+            return (len(header) == 12 and header[:4] == b'wOF2'
+                    and int.from_bytes(header[8:12], 'big') == os.path.getsize(path))
+        return os.path.getsize(path) > 0
+    except (OSError, EOFError, zlib.error):
+        return False
+
+
+class AssetManifest:
+    """dist/assets_manifest.json — 상대경로별 {size, sha256, mtime_ns, url}"""
+
+    def __init__(self, dist_dir):
+        self.dist_dir = dist_dir
+        self.path     = os.path.join(dist_dir, MANIFEST_NAME)
+        self.files    = {}
+        self.dirty    = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def record(self, rel, size, sha256, url=None):
+        path = os.path.join(self.dist_dir, rel)
+        self.files[rel] = {
+            'size':     size,
+            'sha256':   sha256,
+            'mtime_ns': os.stat(path).st_mtime_ns,
+            'url':      url,
+        }
+        self.dirty = True
+
+    def verify(self, rel):
+        """파일이 있고 매니페스트의 크기·해시와 일치하면 True.
+        해시는 파일이 바뀐 경우(mtime 변경)에만 다시 계산합니다."""
+        path = os.path.join(self.dist_dir, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+
+        entry = self.files.get(rel)
+        if entry is None:
+            # 매니페스트 도입 전에 받은 파일: 형식 검사를 통과하면 등록
+            if not _looks_complete(path):
+                return False
+            self.record(rel, st.st_size, file_sha256(path), None)
+            return True
+
+        if st.st_size != entry['size']:
+            return False
+        if st.st_mtime_ns == entry['mtime_ns']:
+            return True
+        if file_sha256(path) != entry['sha256']:
+            return False
+        entry['mtime_ns'] = st.st_mtime_ns
+        self.dirty = True
+        return True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.files},
+                      f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+# ─────────────────────────────────────────────────────────────
+# 다운로드 (이어받기 + 원자적 rename)
+# ─────────────────────────────────────────────────────────────
+def ensure_dir(path):
+    os.makedirs(path, exist_ok=True)
+
+
+def fetch_text(url):
+    req = urllib.request.Request(url, headers={'User-Agent': UA})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.read().decode('utf-8')
+
+
+def _content_range(resp):
+    """206 응답의 Content-Range → (시작, 전체 크기 또는 None)"""
+    m = re.fullmatch(r'bytes (\d+)-\d+/(\d+|\*)', resp.headers.get('Content-Range', '').strip())
+    if not m:
+        return None, None
+    total = m.group(2)
+    return int(m.group(1)), (int(total) if total != '*' else None)
+
+
+def fetch(url, dest_path):
+    """url → dest_path. (크기, SHA-256, 이어받은 바이트 수) 를 반환합니다.
+
+    <dest>.part 가 있으면 Range 요청으로 이어받고, 서버가 Range 를 무시하면 처음부터 받습니다.
+    받은 크기가 Content-Length 와 다르면 OSError (.part 는 다음 시도를 위해 남김).
+    """
+    part = dest_path + '.part'
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+
+    headers = {'User-Agent': UA}
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+    try:
+        resp = urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                      timeout=TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code == 416 and offset:
+            # .part 가 원본보다 크거나 원본이 바뀜 → 처음부터 다시
+            os.remove(part)
+            return fetch(url, dest_path)
+        raise
+
+    with resp:
+        start, total = _content_range(resp) if resp.status == 206 else (None, None)
+        if start != offset:
+            # Range 미지원(200) 또는 엉뚱한 구간 → 처음부터 받음
+            offset = 0
+            length = resp.headers.get('Content-Length')
+            total  = int(length) if length and length.isdigit() else None
+
+        h = hashlib.sha256()
+        if offset:
+            with open(part, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+
+        size = offset
+        with open(part, 'ab' if offset else 'wb') as f:
+            while True:
+                chunk = resp.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                h.update(chunk)
+                size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+    if total is not None and size != total:
+        raise OSError(f'불완전한 다운로드 ({size:,} / {total:,} bytes)')
+    os.replace(part, dest_path)
+    return size, h.hexdigest(), offset
+
+
+def _fetch_with_retry(url, dest_path):
+    """5xx·408·429·네트워크 오류는 잠시 기다렸다가 재시도 (.part 에서 이어받기), 그 외 4xx 는 바로 실패"""
+    for attempt in range(1, RETRIES + 1):
+        try:
+            return fetch(url, dest_path)
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code not in RETRY_STATUSES:
+                raise   # 404 등은 재시도해도 같음
+            if attempt == RETRIES:
+                raise
+        except FETCH_ERRORS:
+            if attempt == RETRIES:
+                raise
+        time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+
+def fetch_all(jobs, manifest, max_workers=MAX_WORKERS):
+    """jobs: [(url, dist 기준 상대경로), ...] 를 동시에 받아 매니페스트에 기록합니다.
+    실패한 상대경로 목록을 반환합니다."""
+    failed = []
+    if not jobs:
+        return failed
+    for _, rel in jobs:
+        ensure_dir(os.path.dirname(os.path.join(manifest.dist_dir, rel)))
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        futures = {
+            pool.submit(_fetch_with_retry, url, os.path.join(manifest.dist_dir, rel)): (url, rel)
+            for url, rel in jobs
+        }
+        for fut in as_completed(futures):
+            url, rel = futures[fut]
+            label = os.path.basename(rel)
+            try:
+                size, sha256, resumed = fut.result()
+            except FETCH_ERRORS as e:
+                print(f'  ✗  {label}: {e}', file=sys.stderr)
+                failed.append(rel)
+                continue
+            manifest.record(rel, size, sha256, url)
+            note = f'  (이어받기 {resumed / 1024:.0f} KB~)' if resumed else ''
+            print(f'  ✓  {label:<42} {size / 1024:>8.1f} KB{note}')
+    manifest.save()
+    return failed
+
+
+# ─────────────────────────────────────────────────────────────
+# 에셋 확인
+# ─────────────────────────────────────────────────────────────
+def font_files(dist_dir):
+    """fonts.css 가 참조하는 woff2 파일명 목록. fonts.css 가 없으면 None"""
+    try:
+        with open(os.path.join(dist_dir, 'fonts', 'fonts.css'), 'r', encoding='utf-8') as f:
+            css_text = f.read()
+    except OSError:
+        return None
+    return sorted(set(re.findall(r"url\('([^']+\.woff2)'\)", css_text)))
+
+
+def check_assets(dist_dir, manifest=None):
+    """누락되었거나 크기·해시가 맞지 않는 에셋 목록을 반환합니다."""
+    manifest = manifest or AssetManifest(dist_dir)
+    missing = []
+
+    # kuromoji.js
+    if not manifest.verify('kuromoji.js'):
+        missing.append('kuromoji.js')
+
+    # dict 파일들
+    bad_dict = [f for f in DICT_FILES if not manifest.verify(f'dict/{f}')]
+    if bad_dict:
+        missing.append(f'dict/ ({len(bad_dict)}개 파일 누락/손상)')
+
+    # fonts.css 가 참조하는 woff2 전부
+    names = font_files(dist_dir)
+    if not names:
+        missing.append('fonts/ (fonts.css 없음)')
+    else:
+        bad_fonts = [n for n in names if not manifest.verify(f'fonts/{n}')]
+        if bad_fonts:
+            missing.append(f'fonts/ ({len(bad_fonts)}개 woff2 누락/손상)')
+
+    manifest.save()
+    return missing
+
+
+# ─────────────────────────────────────────────────────────────
+# 에셋 다운로드 함수 — 각각 실패한 파일이 없으면 True
+# ─────────────────────────────────────────────────────────────
+def download_kuromoji_js(manifest):
+    if manifest.verify('kuromoji.js'):
+        print('  –  kuromoji.js 이미 존재 (skip)')
+        return True
+    print('  Kuromoji JS 다운로드 중...')
+    return not fetch_all([(KUROMOJI_JS_URL, 'kuromoji.js')], manifest)
+
+
+def download_dict_files(manifest):
+    missing = [f for f in DICT_FILES if not manifest.verify(f'dict/{f}')]
+    if not missing:
+        print('  –  dict/ 파일 전부 존재 (skip)')
+        return True
+    print(f'  Kuromoji 사전 파일 다운로드 중 ({len(missing)}개 누락/손상, ~18 MB)...')
+    jobs = [(f'{KUROMOJI_DICT_BASE}/{fname}', f'dict/{fname}') for fname in missing]
+    return not fetch_all(jobs, manifest)
+
+
+def download_fonts(manifest):
+    """Google Fonts CSS 의 woff2 를 받아 로컬 경로로 바꾼 fonts.css 를 생성합니다."""
+    fonts_dir = os.path.join(manifest.dist_dir, 'fonts')
+    ensure_dir(fonts_dir)
+
+    names = font_files(manifest.dist_dir)
+    if names and all(manifest.verify(f'fonts/{n}') for n in names):
+        print(f'  –  fonts/ woff2 파일 존재 ({len(names)}개, skip)')
+        return True
+
+    print('  Google Fonts CSS 가져오는 중...')
+    try:
+        css_text = fetch_text(GOOGLE_FONTS_CSS_URL)
+    except FETCH_ERRORS as e:
+        print(f'  ✗  fonts.css: {e}', file=sys.stderr)
+        return False
+
+    # CSS 안의 woff2 URL 파싱
+    # 패턴: url(https://fonts.gstatic.com/...woff2)  and  font-family: '...'
+    # @font-face 블록 단위로 파싱
+    font_face_pattern = re.compile(r'@font-face\s*\{([^}]+)\}', re.DOTALL)
+    url_pattern       = re.compile(r"url\(([^)]+\.woff2)\)")
+    family_pattern    = re.compile(r"font-family:\s*'([^']+)'")
+    style_pattern     = re.compile(r"font-style:\s*(\w+)")
+    weight_pattern    = re.compile(r"font-weight:\s*(\w+)")
+    unicode_pattern   = re.compile(r"unicode-range:\s*([^;]+);")
+
+    new_font_faces = []
+    local_names    = {}  # url → local filename
+
+    for m in font_face_pattern.finditer(css_text):
+        block = m.group(1)
+        url_m  = url_pattern.search(block)
+        fam_m  = family_pattern.search(block)
+        wgt_m  = weight_pattern.search(block)
+        sty_m  = style_pattern.search(block)
+        uni_m  = unicode_pattern.search(block)
+
+        if not (url_m and fam_m):
+            continue
+
+        woff2_url     = url_m.group(1).strip().strip("'\"")
+        family        = fam_m.group(1)
+        weight        = wgt_m.group(1) if wgt_m else '400'
+        style         = sty_m.group(1) if sty_m else 'normal'
+        unicode_range = uni_m.group(1).strip() if uni_m else None
+
+        # 로컬 파일명 결정 (family + weight + URL 끝 고유 식별자)
+        if woff2_url not in local_names:
+            url_hash    = woff2_url.split('/')[-1].replace('.woff2', '')
+            safe_family = family.replace(' ', '')
+            local_names[woff2_url] = f'{safe_family}-{weight}-{url_hash}.woff2'
+        local_name = local_names[woff2_url]
+
+        # 새 @font-face 블록 생성
+        face_lines = [
+            '@font-face {',
+            f"  font-family: '{family}';",
+            f'  font-style: {style};',
+            f'  font-weight: {weight};',
+            f"  src: url('{local_name}') format('woff2');",
+        ]
+        if unicode_range:
+            face_lines.append(f'  unicode-range: {unicode_range};')
+        face_lines.append('}')
+        new_font_faces.append('\n'.join(face_lines))
+
+    jobs = [(url, f'fonts/{name}') for url, name in local_names.items()
+            if not manifest.verify(f'fonts/{name}')]
+    skipped = len(local_names) - len(jobs)
+    if skipped:
+        print(f'  –  woff2 {skipped}개 이미 존재 (skip)')
+    failed = fetch_all(jobs, manifest)
+
+    # fonts.css 저장 (원자적 교체)
+    fonts_css_path = os.path.join(fonts_dir, 'fonts.css')
+    tmp = fonts_css_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('\n\n'.join(new_font_faces) + '\n')
+    os.replace(tmp, fonts_css_path)
+    manifest.record('fonts/fonts.css', os.path.getsize(fonts_css_path),
+                    file_sha256(fonts_css_path), GOOGLE_FONTS_CSS_URL)
+    manifest.save()
+
+    print(f'  ✓  fonts.css 생성 완료 ({len(new_font_faces)}개 @font-face, {len(local_names)}개 woff2)')
+    return not failed
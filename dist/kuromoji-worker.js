@@ -1,23 +1,39 @@
 // kuromoji-worker.js — Web Worker: kuromoji 초기화 및 토크나이즈 처리
 // 메인 스레드와 postMessage로 통신
 
-importScripts('kuromoji.js');
-
 let tokenizer = null;
+let started   = false;
 
-// 초기화
-kuromoji.builder({ dicPath: 'dict' }).build((err, _tokenizer) => {
-  if (err) {
-    postMessage({ type: 'error', message: err.message || String(err) });
+// 초기화: 페이지가 번들 매니페스트의 해시 파일명을 init 메시지로 전달 (없거나 실패하면 고정 파일명)
+// — 워커는 매니페스트 조회를 기다리지 않고 먼저 생성되어 스크립트 로드·스레드 시작을 겹침
+function init(lib) {
+  started = true;
+  try {
+    try {
+      importScripts(lib || 'kuromoji.js');
+    } catch (e) {
+      if (!lib) throw e;
+      importScripts('kuromoji.js');
+    }
+  } catch (e) {
+    postMessage({ type: 'error', message: 'kuromoji.js 로드 실패: ' + (e.message || String(e)) });
     return;
   }
-  tokenizer = _tokenizer;
-  postMessage({ type: 'ready' });
-});
+  kuromoji.builder({ dicPath: 'dict' }).build((err, _tokenizer) => {
+    if (err) {
+      postMessage({ type: 'error', message: err.message || String(err) });
+      return;
+    }
+    tokenizer = _tokenizer;
+    postMessage({ type: 'ready' });
+  });
+}
 
-// 메인 스레드로부터 토크나이즈 요청 수신
+// 메인 스레드로부터 초기화·토크나이즈 요청 수신
 self.onmessage = function(e) {
-  if (e.data.type === 'tokenize') {
+  if (e.data.type === 'init') {
+    if (!started) init(e.data.lib);
+  } else if (e.data.type === 'tokenize') {
     if (!tokenizer) {
       postMessage({ type: 'tokenize_error', id: e.data.id, message: '초기화 미완료' });
       return;
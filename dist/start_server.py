@@ -6,8 +6,19 @@ start_server.py — tangoya 로컬 서버 실행기
   python3 dist/start_server.py
 
 동작:
-  1. 필요한 에셋(kuromoji.js, dict/, fonts/)이 없으면 자동으로 다운로드합니다
+  1. 필요한 에셋(kuromoji.js, dict/, fonts/)이 없거나 손상됐으면 자동으로 다운로드합니다
+     (asset_fetcher.py — 동시 다운로드, 이어받기, assets_manifest.json 크기·해시 검증)
   2. dist/ 폴더를 루트로 HTTP 서버를 실행합니다 (포트 8000)
+     - 멀티스레드 + HTTP/1.1 keep-alive, sendfile 전송
+     - ETag/Last-Modified 조건부 GET(304), Range(206) 지원
+     - dict/*.dat.gz, fonts/*.woff2, bundle/ 해시 파일명은 장기 캐시(immutable)
+     - build_assets.py 의 사전 압축본(.br/.gz)을 Accept-Encoding 에 맞춰 전송
+     - 127.0.0.1 에만 바인딩, POST 는 같은 출처(localhost)의 application/json 만 허용
+     - /api/user_data: 편집 데이터 조회(ETag)·병합 저장, GitHub 동기화는 백그라운드
+       (TANGOYA_GITHUB_TOKEN 환경변수가 있으면 변경 내용을 GitHub 에 업로드,
+        TANGOYA_GITHUB_SYNC=0 이면 동기화하지 않음)
+     - /metrics: 경로별 요청 수·바이트·지연 히스토그램, 시작 단계 시각, ping 간격,
+       페이지 타이밍 집계 (TANGOYA_TRACE=파일 로 JSON-lines 트레이스 기록)
   3. 브라우저를 자동으로 열어 tangoya.html을 표시합니다
   4. Ctrl+C로 종료합니다
 
@@ -18,15 +29,24 @@ start_server.py — tangoya 로컬 서버 실행기
 """
 
 import http.server
+import socketserver
 import webbrowser
 import threading
 import os
 import sys
 import socket
 import time
+import re
+import json
+import base64
+import hashlib
+import email.utils
 import urllib.request
 import urllib.error
-import re
+from urllib.parse import urlsplit
+from http import HTTPStatus
+
+import asset_fetcher
 
 # ─────────────────────────────────────────────────────────────
 # 경로 설정
@@ -44,202 +64,32 @@ def _find_asset_dir():
     return os.path.dirname(os.path.abspath(__file__))
 
 DIST_DIR  = _find_asset_dir()
-DICT_DIR  = os.path.join(DIST_DIR, 'dict')
-FONTS_DIR = os.path.join(DIST_DIR, 'fonts')
 
 PORT = 8000
+# 같은 컴퓨터의 브라우저만 접속 (다른 기기·외부 사이트가 편집 데이터를 바꾸지 못하도록)
+BIND_ADDRESS = '127.0.0.1'
+LOCAL_HOSTS  = ('localhost', '127.0.0.1')
 
-# ─────────────────────────────────────────────────────────────
-# 에셋 URL 설정
-# ─────────────────────────────────────────────────────────────
-KUROMOJI_VERSION   = '0.1.2'
-KUROMOJI_JS_URL    = f'https://cdn.jsdelivr.net/npm/kuromoji@{KUROMOJI_VERSION}/build/kuromoji.js'
-KUROMOJI_DICT_BASE = f'https://cdn.jsdelivr.net/npm/kuromoji@{KUROMOJI_VERSION}/dict'
-
-DICT_FILES = [
-    'base.dat.gz', 'cc.dat.gz', 'check.dat.gz',
-    'tid.dat.gz', 'tid_map.dat.gz', 'tid_pos.dat.gz',
-    'unk.dat.gz', 'unk_char.dat.gz', 'unk_compat.dat.gz',
-    'unk_invoke.dat.gz', 'unk_map.dat.gz', 'unk_pos.dat.gz',
-]
-
-GOOGLE_FONTS_CSS_URL = (
-    'https://fonts.googleapis.com/css2?'
-    'family=Noto+Serif+JP:wght@400;700'
-    '&family=Noto+Sans+KR:wght@300;400;500;700'
-    '&family=DM+Mono:wght@400;500'
-    '&display=swap'
-)
-
-UA = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+# 버전이 고정된 에셋(사전 파일·해시 포함 woff2)은 브라우저가 1년간 재검증 없이 재사용
+IMMUTABLE_SUFFIXES = ('.dat.gz', '.woff2')
+HASHED_NAME_RE     = re.compile(r'[/\\]bundle[/\\][^/\\]+\.[0-9a-f]{10}\.[a-z0-9]+$')  # build_assets.py 번들
+CACHE_IMMUTABLE    = 'public, max-age=31536000, immutable'
+CACHE_REVALIDATE   = 'no-cache'   # 그 외 파일은 ETag로 매번 재검증 (변경 없으면 304)
 
+# build_assets.py 가 만든 사전 압축본 (Accept-Encoding 우선순위 순)
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
 
 # ─────────────────────────────────────────────────────────────
-# 에셋 존재 여부 확인
+# 에셋 확인 / 다운로드 (asset_fetcher.py 공용 모듈)
 # ─────────────────────────────────────────────────────────────
 def check_assets():
-    """누락된 에셋 목록을 반환합니다."""
-    missing = []
-
-    # kuromoji.js
-    if not os.path.exists(os.path.join(DIST_DIR, 'kuromoji.js')):
-        missing.append('kuromoji.js')
-
-    # dict 파일들
-    missing_dict = [f for f in DICT_FILES
-                    if not os.path.exists(os.path.join(DICT_DIR, f))]
-    if missing_dict:
-        missing.append(f'dict/ ({len(missing_dict)}개 파일 누락)')
-
-    # fonts woff2
-    woff2_files = []
-    if os.path.isdir(FONTS_DIR):
-        woff2_files = [f for f in os.listdir(FONTS_DIR) if f.endswith('.woff2')]
-    if not woff2_files:
-        missing.append('fonts/ (woff2 파일 없음)')
-
-    return missing
-
-
-# ─────────────────────────────────────────────────────────────
-# 다운로드 유틸리티
-# ─────────────────────────────────────────────────────────────
-def ensure_dir(path):
-    os.makedirs(path, exist_ok=True)
-
-
-def download_file(url, dest_path, label=None):
-    label = label or os.path.basename(dest_path)
-    req = urllib.request.Request(url, headers={'User-Agent': UA})
-    try:
-        with urllib.request.urlopen(req, timeout=60) as resp, \
-             open(dest_path, 'wb') as f:
-            downloaded = 0
-            while True:
-                chunk = resp.read(65536)
-                if not chunk:
-                    break
-                f.write(chunk)
-                downloaded += len(chunk)
-            size_kb = downloaded / 1024
-            print(f'  ✓  {label:<42} {size_kb:>8.1f} KB')
-    except urllib.error.URLError as e:
-        print(f'  ✗  {label}: {e}', file=sys.stderr)
-        raise
-
-
-def fetch_text(url):
-    req = urllib.request.Request(url, headers={'User-Agent': UA})
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return resp.read().decode('utf-8')
-
-
-# ─────────────────────────────────────────────────────────────
-# 에셋 다운로드 함수
-# ─────────────────────────────────────────────────────────────
-def _download_if_missing(url, dest, label=None):
-    """파일이 없을 때만 다운로드합니다. 이미 존재하면 skip."""
-    if os.path.exists(dest):
-        return False
-    download_file(url, dest, label or os.path.basename(dest))
-    return True
-
-
-def download_kuromoji_js():
-    dest = os.path.join(DIST_DIR, 'kuromoji.js')
-    if not _download_if_missing(KUROMOJI_JS_URL, dest, 'kuromoji.js'):
-        print('  –  kuromoji.js 이미 존재 (skip)')
-
-
-def download_dict_files():
-    ensure_dir(DICT_DIR)
-    missing = [f for f in DICT_FILES
-               if not os.path.exists(os.path.join(DICT_DIR, f))]
-    if not missing:
-        print('  –  dict/ 파일 전부 존재 (skip)')
-        return
-    print(f'  Kuromoji 사전 파일 다운로드 중 ({len(missing)}개 누락, ~18 MB)...')
-    for fname in missing:
-        _download_if_missing(
-            f'{KUROMOJI_DICT_BASE}/{fname}',
-            os.path.join(DICT_DIR, fname),
-            fname,
-        )
-
-
-def download_fonts():
-    ensure_dir(FONTS_DIR)
-
-    # 이미 woff2 파일이 있으면 스킵
-    existing_woff2 = [f for f in os.listdir(FONTS_DIR) if f.endswith('.woff2')]
-    if existing_woff2:
-        print(f'  –  fonts/ woff2 파일 존재 ({len(existing_woff2)}개, skip)')
-        return
-
-    print('  Google Fonts CSS 가져오는 중...')
-    css_text = fetch_text(GOOGLE_FONTS_CSS_URL)
-
-    font_face_pattern = re.compile(r'@font-face\s*\{([^}]+)\}', re.DOTALL)
-    url_pattern       = re.compile(r"url\(([^)]+\.woff2)\)")
-    family_pattern    = re.compile(r"font-family:\s*'([^']+)'")
-    style_pattern     = re.compile(r"font-style:\s*(\w+)")
-    weight_pattern    = re.compile(r"font-weight:\s*(\w+)")
-    unicode_pattern   = re.compile(r"unicode-range:\s*([^;]+);")
-
-    new_font_faces  = []
-    downloaded_urls = {}
-
-    for m in font_face_pattern.finditer(css_text):
-        block = m.group(1)
-        url_m  = url_pattern.search(block)
-        fam_m  = family_pattern.search(block)
-        wgt_m  = weight_pattern.search(block)
-        sty_m  = style_pattern.search(block)
-        uni_m  = unicode_pattern.search(block)
-
-        if not (url_m and fam_m):
-            continue
-
-        woff2_url     = url_m.group(1).strip().strip("'\"")
-        family        = fam_m.group(1)
-        weight        = wgt_m.group(1) if wgt_m else '400'
-        style         = sty_m.group(1) if sty_m else 'normal'
-        unicode_range = uni_m.group(1).strip() if uni_m else None
-
-        if woff2_url not in downloaded_urls:
-            url_hash    = woff2_url.split('/')[-1].replace('.woff2', '')
-            safe_family = family.replace(' ', '')
-            local_name  = f'{safe_family}-{weight}-{url_hash}.woff2'
-            local_path  = os.path.join(FONTS_DIR, local_name)
-
-            _download_if_missing(woff2_url, local_path, local_name)
-
-            downloaded_urls[woff2_url] = local_name
-
-        local_name = downloaded_urls[woff2_url]
-
-        face_lines = [
-            '@font-face {',
-            f"  font-family: '{family}';",
-            f'  font-style: {style};',
-            f'  font-weight: {weight};',
-            f"  src: url('{local_name}') format('woff2');",
-        ]
-        if unicode_range:
-            face_lines.append(f'  unicode-range: {unicode_range};')
-        face_lines.append('}')
-        new_font_faces.append('\n'.join(face_lines))
-
-    fonts_css_path    = os.path.join(FONTS_DIR, 'fonts.css')
-    fonts_css_content = '\n\n'.join(new_font_faces) + '\n'
-    with open(fonts_css_path, 'w', encoding='utf-8') as f:
-        f.write(fonts_css_content)
-
-    print(f'  ✓  fonts.css 생성 완료 ({len(new_font_faces)}개 @font-face, {len(downloaded_urls)}개 woff2)')
+    """누락되었거나 손상된(크기·SHA-256 불일치) 에셋 목록을 반환합니다."""
+    return asset_fetcher.check_assets(DIST_DIR)
 
 
 def run_setup():
-    """누락된 에셋을 자동으로 다운로드합니다."""
+    """누락된 에셋을 자동으로 다운로드합니다 (동시 다운로드, 끊긴 파일은 이어받기)."""
+    manifest = asset_fetcher.AssetManifest(DIST_DIR)
     print()
     print('=' * 55)
     print('  tangoya — 초기 에셋 자동 다운로드')
@@ -247,13 +97,13 @@ def run_setup():
     print('=' * 55)
 
     print('\n[1/3] Kuromoji JS')
-    download_kuromoji_js()
+    asset_fetcher.download_kuromoji_js(manifest)
 
     print('\n[2/3] Kuromoji 사전 파일')
-    download_dict_files()
+    asset_fetcher.download_dict_files(manifest)
 
     print('\n[3/3] Google Fonts (woff2)')
-    download_fonts()
+    asset_fetcher.download_fonts(manifest)
 
     print()
     print('=' * 55)
@@ -303,41 +153,770 @@ def watchdog(server):
     # 브라우저가 열린 후 ping 모니터링 시작
     # 처음 ping이 올 때까지 잠시 여유 부여
     time.sleep(PING_TIMEOUT + 2)
+    _metrics.phase('watchdog_armed')
 
     while True:
         if time.time() - _state.last_ping > PING_TIMEOUT:
+            _metrics.phase('watchdog_shutdown')
             print('\n  브라우저 탭이 닫혔습니다. 서버를 종료합니다.')
             server.server_close()
             os._exit(0)
         time.sleep(1)
 
 
+# ─────────────────────────────────────────────────────────────
+# 사용자 편집 데이터 — /api/user_data
+# ─────────────────────────────────────────────────────────────
+# 브라우저는 시작 시 이 엔드포인트만 조회하고 (ETag 로 변경 없으면 304),
+# GitHub 와의 동기화는 서버가 백그라운드에서 처리합니다.
+USER_DATA_PATH   = os.path.join(DIST_DIR, 'user_data.json')
+USER_DATA_MAX    = 5 * 1024 * 1024   # POST 본문 상한
+GH_CONTENTS_API_URL = 'https://api.github.com/repos/Jaehyoring/tangoya/contents/dist/user_data.json'
+GH_TOKEN_ENV     = 'TANGOYA_GITHUB_TOKEN'   # 설정 시 변경 내용을 GitHub 에 업로드
+GH_SYNC_ENV      = 'TANGOYA_GITHUB_SYNC'    # '0' 이면 GitHub 동기화 끔 (벤치마크·테스트용)
+GH_TIMEOUT       = 10
+NO_DATE          = '0000-00-00'
+
+
+# 병합 전 형식 확인 대상 (값이 있을 때만 검사)
+USER_DATA_FIELDS = {
+    'exported':     str,
+    'dict_updated': str,
+    'kr_edits':     dict,
+    'custom_words': list,
+    'admin_edits':  dict,
+    'merge_rules':  dict,
+}
+
+
+def _edit_date(entry):
+    date = entry.get('d') if isinstance(entry, dict) else None
+    return date if isinstance(date, str) and date else NO_DATE
+
+
+def _is_kr_edit(value):
+    """구버전 문자열 또는 {k: 뜻, d: 날짜}"""
+    if isinstance(value, str):
+        return True
+    return (isinstance(value, dict) and isinstance(value.get('k'), str)
+            and isinstance(value.get('d', NO_DATE), str))
+
+
+def _is_merge_groups(value):
+    """[[원본 토큰 인덱스, ...], ...] — 페이지의 applyMergeGroups 가 그대로 사용"""
+    return isinstance(value, list) and all(
+        isinstance(group, list)
+        and all(isinstance(i, int) and not isinstance(i, bool) for i in group)
+        for group in value)
+
+
+def check_user_data(data):
+    """merge_user_data 와 페이지가 처리할 수 있는 형식인지 값 단위까지 확인합니다. 아니면 ValueError
+    (잘못된 값이 user_data.json 에 저장되면 이후 모든 페이지 로드에 전달되므로 병합 전에 거부)"""
+    if not isinstance(data, dict):
+        raise ValueError('object expected')
+    for key, kind in USER_DATA_FIELDS.items():
+        if data.get(key) and not isinstance(data[key], kind):
+            raise ValueError(f'{key}: {kind.__name__} expected')
+    for key, value in (data.get('kr_edits') or {}).items():
+        if not _is_kr_edit(value):
+            raise ValueError(f'kr_edits[{key!r}]: string or {{k, d}} expected')
+    for word in data.get('custom_words') or []:
+        if not isinstance(word, dict) or not isinstance(word.get('surface'), str):
+            raise ValueError('custom_words: surface expected')
+    for key, value in (data.get('admin_edits') or {}).items():
+        if not isinstance(value, dict):
+            raise ValueError(f'admin_edits[{key!r}]: object expected')
+    for key, value in (data.get('merge_rules') or {}).items():
+        if not _is_merge_groups(value):
+            raise ValueError(f'merge_rules[{key!r}]: list of index lists expected')
+    criteria = data.get('custom_criteria')
+    if criteria is not None and not isinstance(criteria, (dict, list)):
+        raise ValueError('custom_criteria: object or list expected')
+
+
+def merge_user_data(server, local):
+    """user_data 두 벌을 병합합니다 (브라우저 loadAndApplyServerData 와 같은 규칙).
+      kr_edits / custom_words : 날짜(d)가 더 최신인 쪽, 같으면 local
+      admin_edits / merge_rules: local 우선 (server 에만 있는 키 추가)
+      custom_criteria          : local 에 없을 때만 server
+    """
+    # kr_edits: 날짜 기반
+    kr_edits = dict(local.get('kr_edits') or {})
+    for key, s_entry in (server.get('kr_edits') or {}).items():
+        l_entry = kr_edits.get(key)
+        if not l_entry or _edit_date(s_entry) > _edit_date(l_entry):
+            kr_edits[key] = s_entry
+
+    # custom_words: 날짜 기반 (surface 기준, 로컬 → 서버 순서 유지)
+    local_words  = {w['surface']: w for w in local.get('custom_words') or []}
+    server_words = {w['surface']: w for w in server.get('custom_words') or []}
+    custom_words = []
+    for surface in list(local_words) + [s for s in server_words if s not in local_words]:
+        lw, sw = local_words.get(surface), server_words.get(surface)
+        if not sw:
+            custom_words.append(lw)
+        elif not lw:
+            custom_words.append(sw)
+        else:
+            custom_words.append(sw if _edit_date(sw) > _edit_date(lw) else lw)
+
+    dict_dates = [d for d in (server.get('dict_updated'), local.get('dict_updated'))
+                  if d and d != '-']
+    return {
+        'exported':        max(server.get('exported') or '', local.get('exported') or '') or '-',
+        'dict_updated':    max(dict_dates) if dict_dates else '-',
+        'kr_edits':        kr_edits,
+        'custom_words':    custom_words,
+        'admin_edits':     {**(server.get('admin_edits') or {}), **(local.get('admin_edits') or {})},
+        'merge_rules':     {**(server.get('merge_rules') or {}), **(local.get('merge_rules') or {})},
+        'custom_criteria': local.get('custom_criteria') or server.get('custom_criteria'),
+    }
+
+
+def _user_data_content(data):
+    """비교·저장용 내용 (exported 날짜 제외)"""
+    return {k: v for k, v in data.items() if k != 'exported'}
+
+
+class UserDataStore:
+    """dist/user_data.json 의 메모리 사본. 병합·저장은 lock 안에서, 파일은 원자적으로 교체합니다."""
+
+    def __init__(self, path):
+        self.path    = path
+        self.lock    = threading.Lock()
+        self.changed = threading.Event()   # GitHub 업로드 대기 신호
+        self.data    = None
+        self.body    = b''
+        self.etag    = None
+        self.gh_sha  = None                # GitHub 파일 sha (업로드 시 필요)
+
+    def _set(self, data, body):
+        self.data = data
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+    def _ensure_loaded(self):
+        if self.data is not None:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                body = f.read()
+            data = json.loads(body)
+            check_user_data(data)
+        except (OSError, ValueError):
+            body, data = b'', {}
+        self._set(data, body or json.dumps(data).encode('utf-8'))
+
+    def snapshot(self):
+        """(본문 bytes, ETag)"""
+        with self.lock:
+            self._ensure_loaded()
+            return self.body, self.etag
+
+    def merge(self, incoming, source='local'):
+        """incoming 을 local 로 보고 현재 데이터(server)와 병합 후 저장합니다.
+        내용이 바뀌었으면 True."""
+        with self.lock:
+            self._ensure_loaded()
+            if source == 'local':
+                merged = merge_user_data(self.data, incoming)
+            else:
+                # GitHub 에서 받은 데이터: 이 컴퓨터의 파일을 local 로 취급
+                merged = merge_user_data(incoming, self.data)
+            if _user_data_content(merged) == _user_data_content(self.data):
+                return False
+            merged['exported'] = time.strftime('%Y-%m-%d')
+            body = json.dumps(merged, ensure_ascii=False, indent=2).encode('utf-8')
+            tmp = self.path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._set(merged, body)
+        if source == 'local':
+            self.changed.set()
+        return True
+
+
+_user_data = UserDataStore(USER_DATA_PATH)
+
+
+def _github_request(method, token=None, payload=None):
+    headers = {'Accept': 'application/vnd.github.v3+json', 'User-Agent': 'tangoya'}
+    if token:
+        headers['Authorization'] = f'token {token}'
+    data = None
+    if payload is not None:
+        headers['Content-Type'] = 'application/json'
+        data = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(GH_CONTENTS_API_URL, data=data, headers=headers, method=method)
+    with urllib.request.urlopen(req, timeout=GH_TIMEOUT) as resp:
+        return json.loads(resp.read())
+
+
+def _github_pull(store):
+    """GitHub 의 user_data.json 을 받아 병합. 이 컴퓨터에만 있는 편집이 있으면 업로드 대기"""
+    info = _github_request('GET')
+    store.gh_sha = info.get('sha')
+    remote = json.loads(base64.b64decode(info['content']).decode('utf-8'))
+    check_user_data(remote)   # 형식이 다르면 ValueError (동기화 스레드가 죽지 않도록 병합 전에 확인)
+    if store.merge(remote, source='github'):
+        print('  ✓ GitHub user_data.json 병합 완료')
+    with store.lock:
+        if _user_data_content(store.data) != _user_data_content(merge_user_data(remote, {})):
+            store.changed.set()
+
+
+def github_sync(store):
+    """백그라운드: 시작 시 GitHub 의 user_data.json 을 받아 병합하고,
+    토큰(TANGOYA_GITHUB_TOKEN)이 있으면 이후 로컬 변경을 GitHub 에 업로드합니다."""
+    try:
+        _github_pull(store)
+    except (OSError, ValueError, KeyError) as e:
+        print(f'  –  GitHub user_data.json 동기화 생략 ({e.__class__.__name__})')
+
+    token = os.environ.get(GH_TOKEN_ENV)
+    if not token:
+        return
+    while True:
+        store.changed.wait()
+        time.sleep(2)   # 연속 편집은 한 번에 업로드
+        store.changed.clear()
+        for attempt in range(2):
+            body, _ = store.snapshot()
+            payload = {
+                'message': f'sync: user_data {time.strftime("%Y-%m-%d")}',
+                'content': base64.b64encode(body).decode('ascii'),
+            }
+            if store.gh_sha:
+                payload['sha'] = store.gh_sha
+            try:
+                store.gh_sha = _github_request('PUT', token, payload)['content']['sha']
+                break
+            except urllib.error.HTTPError as e:
+                if e.code not in (409, 422) or attempt:
+                    print(f'  ✗ GitHub 업로드 실패: {e}', file=sys.stderr)
+                    break
+                # 다른 기기가 먼저 업로드함 → 받아서 병합 후 한 번 더 시도
+                try:
+                    _github_pull(store)
+                except (OSError, ValueError, KeyError):
+                    break
+            except (OSError, ValueError, KeyError) as e:
+                print(f'  ✗ GitHub 업로드 실패: {e}', file=sys.stderr)
+                break
+
+
+# ─────────────────────────────────────────────────────────────
+# 런타임 지표 — /metrics
+# ─────────────────────────────────────────────────────────────
+# GET  /metrics        : 경로별 요청 수·전송 바이트·지연 히스토그램, main() 단계 시각,
+#                        ping 간격, 페이지가 보고한 타이밍 집계 (JSON)
+# POST /metrics/client : 페이지 타이밍 보고 {"이름": [ms, ...], ...} (값 하나면 숫자도 가능)
+# TANGOYA_TRACE=파일경로 로 실행하면 모든 이벤트를 JSON-lines 로 기록합니다.
+TRACE_ENV          = 'TANGOYA_TRACE'
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+MAX_METRIC_PATHS   = 100      # 경로 종류 상한 (초과분은 '(other)')
+MAX_CLIENT_NAMES   = 50       # 페이지 타이밍 이름 종류 상한
+CLIENT_REPORT_MAX  = 64 * 1024
+
+
+class Histogram:
+    """누적되지 않는 버킷 히스토그램 + count/sum/min/max (ms 단위)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts  = [0] * (len(buckets) + 1)   # 마지막 칸: 최대 버킷 초과
+        self.count   = 0
+        self.sum     = 0.0
+        self.min     = None
+        self.max     = None
+
+    def add(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum   += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """버킷 상한 기준 근사 분위수"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return round(min(bound, self.max), 3)
+        return round(self.max, 3)
+
+    def to_dict(self):
+        labels = [f'le_{b}' for b in self.buckets] + ['inf']
+        return {
+            'count':   self.count,
+            'sum_ms':  round(self.sum, 3),
+            'min_ms':  None if self.min is None else round(self.min, 3),
+            'max_ms':  None if self.max is None else round(self.max, 3),
+            'mean_ms': round(self.sum / self.count, 3) if self.count else None,
+            'p50_ms':  self.quantile(0.5),
+            'p95_ms':  self.quantile(0.95),
+            'buckets': {k: n for k, n in zip(labels, self.counts) if n},
+        }
+
+
+class Metrics:
+    """서버 런타임 지표. 모든 갱신은 lock 안에서 합니다."""
+
+    def __init__(self, trace_path=None):
+        self.lock      = threading.Lock()
+        self.started   = time.time()
+        self.phases    = {}       # main() 단계 → 프로세스 시작 후 경과 초
+        self.paths     = {}       # 경로 → {'count', 'bytes', 'status', 'latency'}
+        self.pings     = Histogram(buckets=(1000, 2000, 3000, 4000, 5000, 6000, 8000, 10000))
+        self.last_ping = None
+        self.client    = {}       # 페이지 타이밍 이름 → Histogram
+        self.trace_file = open(trace_path, 'a', encoding='utf-8') if trace_path else None
+
+    def _trace(self, event, **fields):
+        if self.trace_file is None:
+            return
+        record = {'t': round(time.time(), 6), 'event': event, **fields}
+        self.trace_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.trace_file.flush()
+
+    def phase(self, name):
+        """main() 진행 단계 기록 (같은 이름은 처음 한 번만)"""
+        with self.lock:
+            if name in self.phases:
+                return
+            elapsed = round(time.time() - self.started, 6)
+            self.phases[name] = elapsed
+            self._trace('phase', name=name, elapsed_s=elapsed)
+
+    def request(self, method, path, status, nbytes, ms):
+        key = _metric_path(path)
+        with self.lock:
+            if key not in self.paths and len(self.paths) >= MAX_METRIC_PATHS:
+                key = '(other)'
+            entry = self.paths.get(key)
+            if entry is None:
+                entry = self.paths[key] = {'count': 0, 'bytes': 0, 'status': {},
+                                           'latency': Histogram()}
+            entry['count'] += 1
+            entry['bytes'] += nbytes
+            entry['status'][str(status)] = entry['status'].get(str(status), 0) + 1
+            entry['latency'].add(ms)
+            self._trace('request', method=method, path=path, status=status,
+                        bytes=nbytes, ms=round(ms, 3))
+
+    def ping(self, now):
+        with self.lock:
+            if self.last_ping is not None:
+                interval = (now - self.last_ping) * 1000
+                self.pings.add(interval)
+                self._trace('ping', interval_ms=round(interval, 1))
+            self.last_ping = now
+
+    def client_timings(self, timings):
+        """페이지가 보고한 타이밍 {이름: [ms, ...]} 집계 (표본마다 한 번씩). 잘못된 항목은 건너뜀"""
+        with self.lock:
+            for name, samples in timings.items():
+                if not isinstance(name, str) or len(name) > 64:
+                    continue
+                if not isinstance(samples, list):
+                    samples = [samples]
+                for ms in samples:
+                    if (isinstance(ms, bool) or not isinstance(ms, (int, float))
+                            or not 0 <= ms < 3600_000):
+                        continue
+                    hist = self.client.get(name)
+                    if hist is None:
+                        if len(self.client) >= MAX_CLIENT_NAMES:
+                            break
+                        hist = self.client[name] = Histogram(
+                            buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000))
+                    hist.add(float(ms))
+                    self._trace('client', name=name, ms=round(float(ms), 3))
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'uptime_s': round(time.time() - self.started, 3),
+                'phases':   dict(self.phases),
+                'requests': {
+                    key: {'count': e['count'], 'bytes': e['bytes'], 'status': dict(e['status']),
+                          'latency': e['latency'].to_dict()}
+                    for key, e in sorted(self.paths.items())
+                },
+                'ping_interval': self.pings.to_dict(),
+                'client':   {name: h.to_dict() for name, h in sorted(self.client.items())},
+            }
+
+
+def _metric_path(path):
+    """지표 집계 키: 쿼리 제거, 폰트 파일(수백 개)은 한 묶음으로"""
+    path = urlsplit(path).path
+    if path.startswith('/fonts/') and path.endswith('.woff2'):
+        return '/fonts/*.woff2'
+    return path
+
+
+_metrics = Metrics(os.environ.get(TRACE_ENV))
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """요청마다 스레드를 띄우는 HTTP 서버.
+    큰 사전 파일 전송 중에도 /ping 이나 다른 에셋 요청이 대기하지 않습니다."""
+    daemon_threads = True
+
+
+def _cache_control(path):
+    """파일 경로에 맞는 Cache-Control 값을 반환합니다."""
+    if path.endswith(IMMUTABLE_SUFFIXES) or HASHED_NAME_RE.search(path):
+        return CACHE_IMMUTABLE
+    return CACHE_REVALIDATE
+
+
+def _accepted_encodings(header):
+    """Accept-Encoding 헤더에서 허용된(q>0) 인코딩 이름 집합"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        m = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if m:
+            try:
+                q = float(m.group(1))
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def _precompressed_variant(path, mtime, accept_encoding):
+    """(인코딩, 파일경로) — 원본보다 오래되지 않은 사전 압축본이 있고 클라이언트가 허용할 때.
+    두 번째 값: 압축본이 하나라도 있는지 (Vary 헤더 필요 여부)"""
+    has_variant = False
+    accepted = None
+    for encoding, suffix in PRECOMPRESSED:
+        try:
+            if os.stat(path + suffix).st_mtime < mtime:
+                continue   # 원본이 새로 빌드됨 → 오래된 압축본 무시
+        except OSError:
+            continue
+        has_variant = True
+        if accepted is None:
+            accepted = _accepted_encodings(accept_encoding)
+        if encoding in accepted:
+            return (encoding, path + suffix), True
+    return None, has_variant
+
+
+def _parse_range(header, size):
+    """Range 헤더('bytes=a-b' 단일 구간)를 (start, end)로 변환합니다.
+    지원하지 않는 형식이면 None (전체 전송)을 반환합니다."""
+    m = re.fullmatch(r'bytes=(\d*)-(\d*)', header.strip())
+    if not m or m.group(1) == m.group(2) == '':
+        return None
+    first, last = m.groups()
+    if first == '':
+        # 접미 구간: 마지막 N바이트
+        length = int(last)
+        if length == 0:
+            return (size, size)
+        return (max(size - length, 0), size - 1)
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return (start, start)
+    end = int(last) if last else size - 1
+    return (start, min(end, size - 1))
+
+
 class QuietHandler(http.server.SimpleHTTPRequestHandler):
-    """로그를 최소화한 HTTP 핸들러"""
+    """로그를 최소화한 HTTP 핸들러
+
+    HTTP/1.1 keep-alive, ETag/Last-Modified 조건부 GET(304), 단일 Range(206),
+    sendfile 기반 파일 전송을 지원합니다.
+    """
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 작은 본문을 나눠 쓰는 keep-alive 응답이 Nagle + 지연 ACK 로
+    # 수십 ms 씩 멈추지 않도록 TCP_NODELAY 설정
+    disable_nagle_algorithm = True
+
+    _t_start = None   # 현재 요청 처리 시작 시각 (perf_counter)
+
     def log_message(self, format, *args):
-        # 사전 파일 / 폰트 / ping 요청은 로그 생략
-        path = args[0] if args else ''
-        if '.dat.gz' in str(path) or '.woff2' in str(path) or '/ping' in str(path):
+        # 사전 파일 / 폰트 / ping / metrics 요청은 로그 생략 (지표는 /metrics 에서 확인)
+        path = str(args[0]) if args else ''
+        if '.dat.gz' in path or '.woff2' in path or '/ping' in path or '/metrics' in path:
             return
         print(f'  [{self.address_string()}] {args[0]}')
 
+    # ── 요청 지표 수집 ─────────────────────────────────────
+    def parse_request(self):
+        # 요청 줄을 읽은 직후부터 측정 (keep-alive 대기 시간 제외)
+        self._t_start = time.perf_counter()
+        self._status  = None
+        self._length  = 0
+        return super().parse_request()
+
+    def send_response_only(self, code, message=None):
+        self._status = int(code)
+        super().send_response_only(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length':
+            self._length = int(value)
+        super().send_header(keyword, value)
+
+    def handle_one_request(self):
+        super().handle_one_request()
+        if self._t_start is not None and self._status is not None:
+            nbytes = 0 if self.command == 'HEAD' or self._status == 304 else self._length
+            _metrics.request(self.command, self.path, self._status, nbytes,
+                             (time.perf_counter() - self._t_start) * 1000)
+        self._t_start = None
+
     def do_GET(self):
-        if self.path == '/ping':
-            _state.last_ping  = time.time()
+        path = urlsplit(self.path).path
+        if path == '/api/user_data':
+            self._send_user_data()
+        elif path == '/metrics':
+            self._send_json(json.dumps(_metrics.snapshot(), ensure_ascii=False, indent=2).encode('utf-8'))
+        elif self.path == '/ping':
+            now = time.time()
+            if not _state.app_opened:
+                _metrics.phase('first_ping')
+            _metrics.ping(now)
+            _state.last_ping  = now
             _state.app_opened = True
             self.send_response(200)
             self.send_header('Content-Type', 'text/plain')
-            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Content-Length', '2')
+            self.send_header('Cache-Control', 'no-store')
             self.end_headers()
             self.wfile.write(b'ok')
         else:
             super().do_GET()
 
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if not self._is_local_request():
+            self.send_error(HTTPStatus.FORBIDDEN, explain='같은 출처(localhost)의 요청만 허용합니다')
+            return
+        if self.headers.get_content_type() != 'application/json':
+            # text/plain 등 CORS 사전 요청이 없는 형식은 거부
+            self.send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, explain='application/json 만 허용합니다')
+            return
+        if path == '/metrics/client':
+            self._receive_client_timings()
+            return
+        if path != '/api/user_data':
+            self.send_error(HTTPStatus.NOT_FOUND, 'Not found')
+            return
+        length = self._content_length(USER_DATA_MAX)
+        if length is None:
+            return
+        try:
+            incoming = json.loads(self.rfile.read(length))
+            check_user_data(incoming)
+            _user_data.merge(incoming)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, explain=f'잘못된 user_data: {e}')
+            return
+        self._send_user_data(conditional=False)
+
+    def _is_local_request(self):
+        """Host 가 이 서버의 localhost 주소이고, Origin 이 있으면 같은 출처인지 확인
+        (다른 사이트의 폼·fetch 와 DNS 리바인딩 차단)"""
+        port = self.server.server_address[1]
+        host = self.headers.get('Host', '')
+        if host not in [f'{name}:{port}' for name in LOCAL_HOSTS]:
+            return False
+        origin = self.headers.get('Origin')
+        return origin is None or origin == f'http://{host}'
+
+    def _content_length(self, limit):
+        """POST 본문 길이. 없거나 음수거나 limit 초과면 오류 응답 후 None"""
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.send_error(HTTPStatus.LENGTH_REQUIRED)
+            return None
+        if length < 0:
+            self.send_error(HTTPStatus.BAD_REQUEST, explain='Content-Length 가 음수입니다')
+            return None
+        if length > limit:
+            self.send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return None
+        return length
+
+    def _receive_client_timings(self):
+        """페이지 타이밍 보고 {"이름": [ms, ...], ...} → 집계 후 204"""
+        length = self._content_length(CLIENT_REPORT_MAX)
+        if length is None:
+            return
+        try:
+            timings = json.loads(self.rfile.read(length))
+            if not isinstance(timings, dict):
+                raise ValueError('object expected')
+        except ValueError as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, explain=f'잘못된 타이밍 보고: {e}')
+            return
+        _metrics.client_timings(timings)
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send_json(self, body):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_user_data(self, conditional=True):
+        """병합된 user_data.json 을 ETag 와 함께 전송 (If-None-Match 일치 시 304)"""
+        body, etag = _user_data.snapshot()
+        if conditional and etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
     def end_headers(self):
-        # dat.gz 파일에 CORS 헤더 추가
-        self.send_header('Access-Control-Allow-Origin', '*')
+        # dat.gz 등 정적 파일에 CORS 헤더 추가 (편집 데이터·지표는 같은 출처에서만)
+        path = urlsplit(getattr(self, 'path', '')).path
+        if not path.startswith(('/api/', '/metrics')):
+            self.send_header('Access-Control-Allow-Origin', '*')
         super().end_headers()
 
+    def _is_not_modified(self, etag, mtime):
+        """If-None-Match / If-Modified-Since 기준으로 캐시가 유효한지 판단합니다."""
+        inm = self.headers.get('If-None-Match')
+        if inm is not None:
+            tags = [t.strip() for t in inm.split(',')]
+            return '*' in tags or etag in tags or f'W/{etag}' in tags
+        ims = self.headers.get('If-Modified-Since')
+        if ims is None:
+            return False
+        try:
+            ims_time = email.utils.parsedate_to_datetime(ims).timestamp()
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        return int(mtime) <= ims_time
+
+    def send_head(self):
+        """정적 파일 응답 헤더를 전송하고 본문용 파일 객체를 반환합니다.
+        본문 전송 구간은 self._body_range = (offset, count)로 copyfile에 전달됩니다."""
+        self._body_range = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or path.endswith('/'):
+            return super().send_head()
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return None
+
+        try:
+            fs    = os.fstat(f.fileno())
+            ctype = self.guess_type(path)
+            cache = _cache_control(path)
+            variant, vary = _precompressed_variant(path, fs.st_mtime,
+                                                   self.headers.get('Accept-Encoding'))
+            encoding = None
+            if variant:
+                try:
+                    encoded = open(variant[1], 'rb')
+                except OSError:
+                    pass
+                else:
+                    f.close()
+                    f = encoded
+                    encoding = variant[0]
+                    fs = os.fstat(f.fileno())
+            size  = fs.st_size
+            etag  = f'"{fs.st_mtime_ns:x}-{size:x}{"-" + encoding if encoding else ""}"'
+
+            if self._is_not_modified(etag, fs.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', cache)
+                if vary:
+                    self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                f.close()
+                return None
+
+            byte_range = None
+            range_header = self.headers.get('Range')
+            if_range     = self.headers.get('If-Range')
+            if range_header and (if_range is None or if_range.strip() == etag):
+                byte_range = _parse_range(range_header, size)
+
+            if byte_range and byte_range[0] >= size:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                f.close()
+                return None
+
+            if byte_range:
+                start, end = byte_range
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                self._body_range = (start, end - start + 1)
+            else:
+                self.send_response(HTTPStatus.OK)
+                self._body_range = (0, size)
+            self.send_header('Content-Type', ctype)
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            if vary:
+                self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', str(self._body_range[1]))
+            self.send_header('Last-Modified', self.date_time_string(fs.st_mtime))
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.end_headers()
+            return f
+        except:
+            f.close()
+            raise
+
+    def copyfile(self, source, outputfile):
+        """파일 본문을 socket.sendfile로 전송합니다 (지원되지 않는 OS는 자동 폴백)."""
+        if self._body_range is None:
+            # 디렉터리 목록 등 메모리 버퍼 응답
+            super().copyfile(source, outputfile)
+            return
+        offset, count = self._body_range
+        try:
+            self.connection.sendfile(source, offset, count)
+        except (BrokenPipeError, ConnectionResetError):
+            # 브라우저가 전송 도중 요청을 취소한 경우
+            self.close_connection = True
+
 
 # ─────────────────────────────────────────────────────────────
 # 메인
@@ -345,6 +924,7 @@ class QuietHandler(http.server.SimpleHTTPRequestHandler):
 def main():
     # dist/ 폴더를 서버 루트로 설정
     os.chdir(DIST_DIR)
+    _metrics.phase('start')
 
     # 1. 누락 에셋 확인 → 자동 다운로드
     missing = check_assets()
@@ -353,8 +933,11 @@ def main():
         print('  ⚠️  다음 에셋이 없습니다:')
         for item in missing:
             print(f'      • {item}')
+        _metrics.phase('assets_checked')
         run_setup()
+        _metrics.phase('setup_done')
     else:
+        _metrics.phase('assets_checked')
         print()
         print('  ✓ 에셋 확인 완료 (모두 존재)')
 
@@ -372,24 +955,34 @@ def main():
     port = find_free_port(PORT)
     url  = f'http://localhost:{port}/tangoya.html'
 
-    server = http.server.HTTPServer(('', port), QuietHandler)
+    server = ThreadingServer((BIND_ADDRESS, port), QuietHandler)
+    _metrics.phase('bound')
 
     print('=' * 55)
     print('  tangoya 로컬 서버')
     print('=' * 55)
     print(f'  URL   : {url}')
     print(f'  루트  : {os.getcwd()}')
+    print(f'  지표  : http://localhost:{port}/metrics')
     print(f'  종료  : Ctrl + C')
     print('=' * 55)
     print()
 
     # 브라우저 자동 열기 (서버 시작 후 0.8초)
-    threading.Timer(0.8, lambda: webbrowser.open(url)).start()
+    def open_browser():
+        _metrics.phase('browser_open')
+        webbrowser.open(url)
+    threading.Timer(0.8, open_browser).start()
+
+    # GitHub user_data.json 백그라운드 동기화 (페이지는 /api/user_data 만 조회)
+    if os.environ.get(GH_SYNC_ENV) != '0':
+        threading.Thread(target=github_sync, args=(_user_data,), daemon=True).start()
 
     # 탭 닫힘 감지 워치독 스레드
     wd = threading.Thread(target=watchdog, args=(server,), daemon=True)
     wd.start()
 
+    _metrics.phase('serving')
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -0,0 +1,108 @@
+// sw.js — 서비스 워커: 사전·폰트·번들 파일 오프라인 캐시
+// tangoya.html 이 등록합니다. 목록은 build/build_assets.py 가 만든 bundle/manifest.json 을 사용
+//
+// 캐시 전략
+//   - 내용이 바뀌지 않는 파일 (bundle/ 해시 파일명 — 로컬 fonts.css 포함, dict/*.dat.gz, *.woff2, Google Fonts 폰트)
+//       → 캐시 우선 (한 번 받으면 네트워크 요청 없음)
+//   - 그 외 같은 출처 파일 (tangoya.html, kuromoji-worker.js, manifest 등)
+//       → 네트워크 우선, 실패(오프라인) 시 캐시
+//       (쿼리 문자열이 있는 요청·user_data.json 은 캐시에 저장하지 않음 — URL 이 매번 달라 캐시가 계속 커짐)
+//   - /ping, /api/, /metrics → 가로채지 않음 (서버 상태·편집 데이터)
+//   - 불투명(opaque) 교차 출처 응답은 저장하지 않음 (검증 불가, 저장 용량을 크게 차지)
+
+const STATIC_CACHE = 'tangoya-static-v1';   // 불변 파일
+const PAGE_CACHE   = 'tangoya-pages-v1';    // 재검증 파일
+const CACHES       = [STATIC_CACHE, PAGE_CACHE];
+const MANIFEST_URL = 'bundle/manifest.json';
+
+const PASSTHROUGH  = /\/(ping|api\/|metrics)/;
+const NO_STORE     = /\/user_data\.json$/;   // 정적 호스팅 fallback (항상 네트워크)
+const IMMUTABLE    = /(\/bundle\/[^/]+\.[0-9a-f]{10}\.[a-z0-9]+|\.dat\.gz|\.woff2)$/;
+const FONT_HOSTS   = ['fonts.googleapis.com', 'fonts.gstatic.com'];
+
+// ── 설치: 매니페스트의 offline 목록 미리 캐시 ─────────────
+self.addEventListener('install', event => {
+  event.waitUntil((async () => {
+    try {
+      const resp = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+      if (resp.ok) {
+        const manifest = await resp.clone().json();
+        const cache = await caches.open(STATIC_CACHE);
+        await cache.addAll((manifest.offline || []).filter(url => IMMUTABLE.test('/' + url)));
+        const pages = await caches.open(PAGE_CACHE);
+        await pages.put(MANIFEST_URL, resp);
+        await pages.addAll((manifest.offline || []).filter(url => !IMMUTABLE.test('/' + url)));
+      }
+    } catch (e) {
+      // 매니페스트 없음(정적 호스팅) — 사용하면서 캐시
+    }
+    await self.skipWaiting();
+  })());
+});
+
+// ── 활성화: 이전 버전 캐시 삭제 ─────────────────────────
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    for (const name of await caches.keys()) {
+      if (name.startsWith('tangoya-') && !CACHES.includes(name)) await caches.delete(name);
+    }
+    await self.clients.claim();
+  })());
+});
+
+/** 새 매니페스트에 없는 이전 번들 파일을 캐시에서 삭제 */
+async function pruneBundle(manifest) {
+  const current = new Set((manifest.offline || []).map(url => new URL(url, self.registration.scope).href));
+  Object.values(manifest.assets || {}).forEach(url => current.add(new URL(url, self.registration.scope).href));
+  const cache = await caches.open(STATIC_CACHE);
+  for (const req of await cache.keys()) {
+    if (req.url.includes('/bundle/') && !current.has(req.url)) await cache.delete(req);
+  }
+}
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) return cached;
+  const resp = await fetch(request);
+  if (resp.ok) {
+    const cache = await caches.open(STATIC_CACHE);
+    cache.put(request, resp.clone());
+  }
+  return resp;
+}
+
+async function networkFirst(request, isManifest, store = true) {
+  try {
+    const resp = await fetch(request);
+    if (resp.ok && store) {
+      const cache = await caches.open(PAGE_CACHE);
+      cache.put(request, resp.clone());
+      if (isManifest) resp.clone().json().then(pruneBundle).catch(() => {});
+    }
+    return resp;
+  } catch (e) {
+    // 오프라인: 쿼리 문자열만 다른 요청도 같은 경로의 캐시로 응답
+    const cached = await caches.match(request, { ignoreSearch: true });
+    if (cached) return cached;
+    throw e;
+  }
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+
+  if (url.origin === self.location.origin) {
+    if (PASSTHROUGH.test(url.pathname) || NO_STORE.test(url.pathname)) return;
+    if (IMMUTABLE.test(url.pathname)) {
+      event.respondWith(cacheFirst(request));
+    } else {
+      // 쿼리 문자열이 있는 요청은 저장하지 않음 (오프라인이면 같은 경로의 캐시로 응답)
+      event.respondWith(networkFirst(request, url.pathname.endsWith('/' + MANIFEST_URL), !url.search));
+    }
+  } else if (FONT_HOSTS.includes(url.hostname)) {
+    // Google Fonts: CSS 는 갱신 확인, 폰트 파일은 URL 이 버전별로 고정
+    event.respondWith(url.hostname === 'fonts.gstatic.com' ? cacheFirst(request) : networkFirst(request));
+  }
+});